@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare load time and peak RSS of the JSON task file and the binary snapshot.
+
+Usage: python benchmarks/snapshot_load.py [task_count]
+Each measurement runs in a fresh interpreter so RSS numbers don't bleed into each other.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from src.task_manager import Task, TaskManager, Priority, TaskStatus
+from src.snapshot import write_snapshot
+
+CASES = {
+    'json: TaskManager load': """
+tm = TaskManager(path, archive_dir)
+result = len(tm.tasks)
+""",
+    'snapshot: TaskManager load': """
+tm = TaskManager(path, archive_dir)
+result = len(tm.tasks)
+""",
+    'json: count by status': """
+tm = TaskManager(path, archive_dir)
+result = len(tm.get_tasks_by_status(TaskStatus.TODO))
+""",
+    'snapshot: count by status (mmap)': """
+with TaskSnapshot(path) as snapshot:
+    result = snapshot.count_by_status()[TaskStatus.TODO]
+""",
+    'snapshot: list high priority todo (mmap)': """
+with TaskSnapshot(path) as snapshot:
+    result = sum(1 for i in snapshot.matching_indexes(TaskStatus.TODO, Priority.HIGH)
+                 if snapshot.row(i))
+""",
+}
+
+RUNNER = """
+import re, sys, time
+sys.path.insert(0, {app_dir!r})
+from src.task_manager import TaskManager, Priority, TaskStatus
+from src.snapshot import TaskSnapshot
+path, archive_dir = {path!r}, {archive_dir!r}
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+# VmHWM is the peak RSS of this interpreter alone; ru_maxrss would inherit the parent's
+with open('/proc/self/status') as f:
+    peak_kib = re.search(r'VmHWM:\\s+(\\d+)', f.read()).group(1)
+print(elapsed, peak_kib, result)
+"""
+
+
+def generate_tasks(count: int):
+    rng = random.Random(42)
+    statuses = list(TaskStatus)
+    for i in range(1, count + 1):
+        status = rng.choice(statuses)
+        yield Task(
+            id=i,
+            title=f"Task number {i}",
+            description="Generated task description " * rng.randint(0, 3),
+            priority=rng.choice(list(Priority)),
+            status=status,
+            created_at="2025-07-09T21:42:48.131669",
+            # Keep completions recent so the archive sweep has nothing to move
+            completed_at="2099-01-01T00:00:00" if status == TaskStatus.COMPLETED else None
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workdir = tempfile.mkdtemp(prefix='pomodoro-bench-')
+    json_path = os.path.join(workdir, 'tasks.json')
+    snap_path = os.path.join(workdir, 'bench.snap')
+    archive_dir = os.path.join(workdir, 'archive')
+
+    print(f"Generating {count:,} tasks in {workdir} ...")
+    writer = TaskManager(os.path.join(workdir, 'unused.json'), archive_dir)
+    writer.tasks = list(generate_tasks(count))
+    writer.next_id = count + 1
+    writer.export_json(json_path)
+    write_snapshot(snap_path, writer.tasks, writer.next_id)
+    del writer
+
+    for label, path in (('JSON', json_path), ('snapshot', snap_path)):
+        print(f"{label} file size: {os.path.getsize(path) / 2**20:.1f} MiB")
+
+    print(f"\n{'case':<42} {'seconds':>8} {'peak RSS':>10}")
+    for label, body in CASES.items():
+        path = json_path if label.startswith('json') else snap_path
+        code = RUNNER.format(app_dir=APP_DIR, path=path, archive_dir=archive_dir, body=body)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        elapsed, max_rss, _result = output.stdout.split()[-3:]
+        print(f"{label:<42} {float(elapsed):>8.2f} {int(max_rss) / 1024:>7.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,21 @@ AUTHOR = "Khadija Abbas"
 # File paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
-TASKS_FILE = os.path.join(DATA_DIR, 'tasks.json')
+TASKS_JSON_FILE = os.path.join(DATA_DIR, 'tasks.json')
+TASKS_SNAPSHOT_FILE = os.path.join(DATA_DIR, 'tasks.snap')
 SETTINGS_FILE = os.path.join(DATA_DIR, 'settings.json')
+ARCHIVE_DIR = os.path.join(DATA_DIR, 'archive')
+SCHEDULES_FILE = os.path.join(DATA_DIR, 'schedules.json')
+SESSION_LOG_FILE = os.path.join(DATA_DIR, 'sessions.log')
+LISTS_DIR = os.path.join(DATA_DIR, 'lists')
+CATALOG_FILE = os.path.join(DATA_DIR, 'lists.json')
+
+# Completed tasks older than this are moved out of TASKS_FILE into ARCHIVE_DIR
+ARCHIVE_AFTER_DAYS = 30
+
+# Storage format for the task list: "json" or "snapshot" (binary, memory-mappable)
+STORAGE_FORMAT = "json"
+TASKS_FILE = TASKS_SNAPSHOT_FILE if STORAGE_FORMAT == "snapshot" else TASKS_JSON_FILE
 
 # Default Timer Settings (in minutes)
 DEFAULT_FOCUS_TIME = 25
@@ -20,6 +33,24 @@ DEFAULT_SHORT_BREAK = 5
 DEFAULT_LONG_BREAK = 15
 DEFAULT_SESSIONS_FOR_LONG_BREAK = 4
 
+# Resolution of the recurring task / scheduled session wheel (in seconds)
+SCHEDULER_TICK_SECONDS = 60
+
+# Session hooks: worker threads, per-worker queue size, per-hook timeout,
+# how long emitting waits on a full queue before dropping the event (seconds)
+# and how many calls of one hook may run at once before further calls are skipped
+HOOK_WORKERS = 2
+HOOK_QUEUE_SIZE = 100
+HOOK_TIMEOUT_SECONDS = 5
+HOOK_ENQUEUE_TIMEOUT = 0.5
+HOOK_MAX_CONCURRENT = 1
+
+# Threads used to load and query task list shards in parallel
+LIST_FANOUT_WORKERS = 4
+
+# Command run on session events, e.g. ["notify-send", "Pomodoro"]; None disables it
+NOTIFY_COMMAND = None
+
 # Task Priority Levels
 PRIORITY_LOW = 1
 PRIORITY_MEDIUM = 2
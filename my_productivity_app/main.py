@@ -9,9 +9,13 @@ if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
 from src.app_interface import PomodoroApp
+from src.cli import run_cli
 from src.utils import display_banner
 
 def main():
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+        
     display_banner()
     app = PomodoroApp()
     app.run()
@@ -1,15 +1,47 @@
 import sys
+import config
 from .task_manager import TaskManager, Priority, TaskStatus
+from .query import QueryError
 from .focus_timer import PomodoroTimer, PomodoroSettings
+from .hooks import HookDispatcher, SESSION_EVENTS, SESSION_COMPLETE, command_hook, log_hook
+from .scheduler import TaskScheduler
+from .task_lists import TaskListCatalog, DEFAULT_LIST
+from .tags import normalize_tags
 from datetime import datetime
 
 
 
 class PomodoroApp:
     def __init__(self):
-        self.task_manager = TaskManager()
+        self.task_lists = TaskListCatalog()
         self.timer_settings = PomodoroSettings()
-        self.timer = PomodoroTimer(self.timer_settings)
+        self.hooks = HookDispatcher()
+        self.timer = PomodoroTimer(self.timer_settings, self.hooks)
+        self.scheduler = TaskScheduler(self.task_lists)
+        self.register_hooks()
+        
+    @property
+    def task_manager(self) -> TaskManager:
+        """Task manager of the active task list"""
+        return self.task_lists.active
+        
+    def register_hooks(self):
+        """Hook task updates, logging and notifications onto session events"""
+        self.hooks.register(SESSION_COMPLETE, self.complete_focus_task)
+        session_log = log_hook()
+        notify = command_hook(config.NOTIFY_COMMAND) if config.NOTIFY_COMMAND else None
+        for event in SESSION_EVENTS:
+            self.hooks.register(event, session_log)
+            if notify:
+                self.hooks.register(event, notify)
+                
+    def complete_focus_task(self, event: str, session: dict):
+        """Mark the task worked on during a finished focus session as completed"""
+        # Runs on a hook thread, possibly after the user switched lists, so the session names its list
+        if (session.get('type') == 'focus' and session.get('task_id')
+                and session.get('task_list') in self.task_lists.lists):
+            task_manager = self.task_lists.get(session['task_list'])
+            task_manager.update_task(session['task_id'], status=TaskStatus.COMPLETED)
         
     def display_banner(self):
         """Display app banner"""
@@ -19,12 +51,14 @@ class PomodoroApp:
         
     def display_main_menu(self):
         """Display main menu options"""
-        print("\n📋 MAIN MENU:")
+        print(f"\n📋 MAIN MENU (list: {self.task_lists.active_name}):")
         print("1. 📝 Task Management")
         print("2. ⚡ Start Focus Session")
         print("3. ⚙️  Settings")
         print("4. 📊 Statistics")
-        print("5. 🚪 Exit")
+        print("5. 🔁 Recurring & Scheduled")
+        print("6. 📚 Task Lists")
+        print("7. 🚪 Exit")
         
     def display_task_menu(self):
         """Display task management menu"""
@@ -35,12 +69,44 @@ class PomodoroApp:
         print("4. ❌ Remove Task")
         print("5. 🔄 Reorder Tasks")
         print("6. ✅ Mark Complete")
-        print("7. 🔙 Back to Main Menu")
+        print("7. 🗄️  View Archive")
+        print("8. 🔎 Search Tasks")
+        print("9. 🔗 Subtasks & Dependencies")
+        print("10. 🔙 Back to Main Menu")
+        
+    def display_dependency_menu(self):
+        """Display subtask and dependency menu"""
+        print("\n🔗 SUBTASKS & DEPENDENCIES:")
+        print("1. ➕ Add Subtask")
+        print("2. 🔗 Add Dependency")
+        print("3. ✂️  Remove Dependency")
+        print("4. 🟢 View Ready Tasks")
+        print("5. 🔙 Back to Task Menu")
+        
+    def display_schedule_menu(self):
+        """Display recurring task and scheduled session menu"""
+        print("\n🔁 RECURRING & SCHEDULED:")
+        print("1. ➕ Add Recurring Task")
+        print("2. ⏰ Schedule Focus Session")
+        print("3. 📋 View Schedules")
+        print("4. ❌ Remove Schedule")
+        print("5. 🔙 Back to Main Menu")
         
-    def display_tasks(self, tasks: list = None):
-        """Display tasks in a formatted table"""
+    def display_lists_menu(self):
+        """Display task list menu"""
+        print("\n📚 TASK LISTS:")
+        print("1. 📋 View Lists")
+        print("2. 🔀 Switch List")
+        print("3. ➕ Create List")
+        print("4. ❌ Delete List")
+        print("5. 🔎 Search All Lists")
+        print("6. 🔙 Back to Main Menu")
+        
+    def display_tasks(self, tasks: list = None, task_manager: TaskManager = None):
+        """Display tasks in a formatted table; ``task_manager`` is the list they belong to"""
+        task_manager = task_manager or self.task_manager
         if tasks is None:
-            tasks = self.task_manager.tasks
+            tasks = task_manager.tasks
             
         if not tasks:
             print("\n📭 No tasks found!")
@@ -67,6 +133,16 @@ class PomodoroApp:
             
             if task.description:
                 print(f"      📄 {task.description}")
+            if task.due_at:
+                print(f"      📅 Due: {datetime.fromisoformat(task.due_at).strftime('%Y-%m-%d %H:%M')}")
+            if task.tags:
+                print(f"      🏷️  {' '.join(f'#{tag}' for tag in task.tags)}")
+            if task.parent_id:
+                print(f"      ↳ Subtask of #{task.parent_id}")
+            # Task IDs are only unique within a list, so blockers come from the task's own list
+            blockers = task_manager.get_blockers(task.id)
+            if blockers:
+                print(f"      🔗 Blocked by: {', '.join(f'#{blocker}' for blocker in blockers)}")
                 
     def add_task_interactive(self):
         """Interactive task addition"""
@@ -88,7 +164,9 @@ class PomodoroApp:
         priority_map = {"1": Priority.LOW, "2": Priority.MEDIUM, "3": Priority.HIGH}
         priority = priority_map.get(priority_choice, Priority.MEDIUM)
         
-        task = self.task_manager.add_task(title, description, priority)
+        tags = input("Tags (e.g. work urgent, optional): ").strip()
+        
+        task = self.task_manager.add_task(title, description, priority, tags=normalize_tags(tags))
         print(f"✅ Task '{task.title}' added successfully! (ID: {task.id})")
         
     def update_task_interactive(self):
@@ -123,6 +201,9 @@ class PomodoroApp:
             print(f"3. {TaskStatus.COMPLETED.value.title()}")
             print(f"Current: {task.status.value.title()}")
             new_status_choice = input("New status (1-3, leave empty to keep current): ").strip()
+            
+            current_tags = " ".join(task.tags)
+            new_tags = input(f"\nNew tags [{current_tags}] ('-' to clear): ").strip()
 
             updates = {}
             if new_title:
@@ -143,6 +224,8 @@ class PomodoroApp:
                     updates['status'] = new_status
                 else:
                     print("Invalid status choice, keeping current.")
+            if new_tags:
+                updates['tags'] = [] if new_tags == '-' else normalize_tags(new_tags)
                     
             if updates:
                 self.task_manager.update_task(task_id, **updates)
@@ -206,17 +289,118 @@ class PomodoroApp:
         except ValueError:
             print("❌ Invalid input!")
 
+    def search_tasks_interactive(self):
+        """Interactive task search using the query language"""
+        print("\n🔎 SEARCH TASKS:")
+        print("Examples: status:todo priority>=2   created:<2025-07-01   meeting sort:-priority limit:10")
+        print("          tag:work tag:urgent,soon tag!=someday status:todo")
+        text = input("Query: ").strip()
+        if not text:
+            return
+            
+        try:
+            self.display_tasks(list(self.task_manager.query(text)))
+        except QueryError as e:
+            print(f"❌ {e}")
+
+    def add_subtask_interactive(self):
+        """Interactive subtask creation"""
+        self.display_tasks()
+        
+        try:
+            parent_id = int(input("\nEnter parent task ID: "))
+        except ValueError:
+            print("❌ Invalid task ID!")
+            return
+        parent = self.task_manager.get_task(parent_id)
+        if not parent:
+            print("❌ Task not found!")
+            return
+            
+        title = input("Subtask title: ").strip()
+        if not title:
+            print("❌ Task title cannot be empty!")
+            return
+        description = input("Description (optional): ").strip()
+        
+        subtask = self.task_manager.add_subtask(parent_id, title, description)
+        print(f"✅ Subtask '{subtask.title}' added to '{parent.title}' (ID: {subtask.id})")
+        
+    def add_dependency_interactive(self):
+        """Interactive dependency creation"""
+        self.display_tasks()
+        
+        try:
+            task_id = int(input("\nTask ID that has to wait: "))
+            depends_on_id = int(input("Task ID it waits for: "))
+        except ValueError:
+            print("❌ Invalid task ID!")
+            return
+            
+        try:
+            self.task_manager.add_dependency(task_id, depends_on_id)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Task #{task_id} now waits for task #{depends_on_id}")
+        
+    def remove_dependency_interactive(self):
+        """Interactive dependency removal"""
+        try:
+            task_id = int(input("\nTask ID: "))
+            task = self.task_manager.get_task(task_id)
+            if not task:
+                print("❌ Task not found!")
+                return
+            if not task.depends_on:
+                print("ℹ️ This task has no dependencies.")
+                return
+            print(f"Waiting for: {', '.join(f'#{dependency}' for dependency in task.depends_on)}")
+            depends_on_id = int(input("Dependency to remove: "))
+        except ValueError:
+            print("❌ Invalid task ID!")
+            return
+            
+        if self.task_manager.remove_dependency(task_id, depends_on_id):
+            print("✅ Dependency removed!")
+        else:
+            print("❌ Dependency not found!")
+
+    def view_archive_interactive(self):
+        """Browse archived tasks month by month"""
+        months = self.task_manager.archive.months()
+        if not months:
+            print("\n🗄️ The archive is empty.")
+            return
+            
+        print("\n🗄️ ARCHIVE:")
+        for i, month in enumerate(months, 1):
+            print(f"{i}. {month} ({self.task_manager.archive.index[month]['count']} tasks)")
+            
+        choice_input = input(f"\nChoose month (1-{len(months)}, leave empty to go back): ").strip()
+        if not choice_input:
+            return
+        if not choice_input.isdigit() or not 1 <= int(choice_input) <= len(months):
+            print("❌ Invalid choice!")
+            return
+            
+        month = months[int(choice_input) - 1]
+        self.display_tasks(list(self.task_manager.iter_archived_tasks(month)))
+
             
     def start_pomodoro_interactive(self):
         """Interactive Pomodoro session start"""
-        todo_tasks = self.task_manager.get_tasks_by_status(TaskStatus.TODO)
+        todo_tasks = self.task_manager.get_ready_tasks()
+        blocked_count = len(self.task_manager.status_index(TaskStatus.TODO)) - len(todo_tasks)
         
-        if not todo_tasks:
+        if not todo_tasks and not blocked_count:
             print("\n📭 No pending tasks! Add some tasks first.")
             return
             
         print("\n⚡ START POMODORO SESSION:")
         print("Select a task to work on:")
+        if blocked_count:
+            print(f"({blocked_count} task(s) hidden until their dependencies are complete)")
         print("0. Work without specific task")
         
         for i, task in enumerate(todo_tasks, 1):
@@ -235,44 +419,272 @@ class PomodoroApp:
             task_id = None
             if 1 <= choice <= len(todo_tasks):
                 task_id = todo_tasks[choice - 1].id
-                # Mark task as in progress
-                self.task_manager.update_task(task_id, status=TaskStatus.IN_PROGRESS)
-                print(f"🔄 Working on: {todo_tasks[choice - 1].title}")
-            elif choice == 0:
-                print("🔄 Starting focus session without specific task")
-            else:
+            elif choice != 0:
                 print("❌ Invalid choice!")
                 return
                 
-            def on_session_complete(completed_task_id):
-                if completed_task_id:
-                    self.task_manager.update_task(completed_task_id, status=TaskStatus.COMPLETED)
-                    print(f"Task ID {completed_task_id} marked as COMPLETED.")
-
-            self.timer.start_focus_session(task_id, on_complete_callback=on_session_complete)
+            self.start_focus_session(task_id)
             
         except ValueError:
             print("❌ Invalid input!")
             
+    def start_focus_session(self, task_id: int = None, task_list: str = None):
+        """Start a focus session, optionally tracking progress on a task of ``task_list`` (default: active list)"""
+        task_list = task_list or self.task_lists.active_name
+        task_manager = self.task_lists.get(task_list)
+        task = task_manager.get_task(task_id) if task_id else None
+        if task:
+            # Mark task as in progress
+            task_manager.update_task(task.id, status=TaskStatus.IN_PROGRESS)
+            print(f"🔄 Working on: {task.title}")
+        else:
+            print("🔄 Starting focus session without specific task")
+            
+        # Completing the task is handled by the complete_focus_task hook
+        self.timer.start_focus_session(task.id if task else None, task_list=task_list)
+        
+    def check_schedules(self):
+        """Materialize due recurring tasks and offer due focus sessions"""
+        new_tasks, due_sessions = self.scheduler.tick()
+        
+        for task in new_tasks:
+            print(f"\n🔁 Recurring task due: {task.title}")
+                
+        for session in due_sessions:
+            task_manager = self.task_lists.get(session.task_list)
+            task = task_manager.get_task(session.task_id) if session.task_id else None
+            label = f"'{task.title}'" if task else "a focus session"
+            start_at = datetime.fromisoformat(session.start_at).strftime("%H:%M")
+            confirm = input(f"\n⏰ Scheduled {start_at}: start {label} now? (Y/n): ").strip()
+            if confirm.lower() != 'n':
+                if task and session.task_list != self.task_lists.active_name:
+                    self.task_lists.switch(session.task_list)
+                    print(f"🔀 Switched to list '{session.task_list}'")
+                self.start_focus_session(task.id if task else None, session.task_list)
+                
+    def add_recurring_task_interactive(self):
+        """Interactive recurring task creation"""
+        print("\n➕ ADD RECURRING TASK:")
+        title = input("Task title: ").strip()
+        
+        if not title:
+            print("❌ Task title cannot be empty!")
+            return
+            
+        description = input("Description (optional): ").strip()
+        
+        print("\nRepeat rule examples:")
+        print("  daily 09:00")
+        print("  weekly mon,thu 18:30")
+        print("  0 8 1 * *   (cron: minute hour day month weekday)")
+        rule = input("Repeat rule: ").strip()
+        
+        priority_choice = input("Choose priority (1-3, default 2): ").strip()
+        priority_map = {"1": Priority.LOW, "2": Priority.MEDIUM, "3": Priority.HIGH}
+        priority = priority_map.get(priority_choice, Priority.MEDIUM)
+        
+        try:
+            recurring = self.scheduler.add_recurring_task(title, rule, description, priority,
+                                                          task_list=self.task_lists.active_name)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        next_run = datetime.fromisoformat(recurring.next_run).strftime("%Y-%m-%d %H:%M")
+        print(f"✅ Recurring task '{title}' added! Next occurrence: {next_run}")
+        
+    def schedule_session_interactive(self):
+        """Interactive focus session scheduling"""
+        print("\n⏰ SCHEDULE FOCUS SESSION:")
+        start_input = input("Start time (YYYY-MM-DD HH:MM, or HH:MM for today): ").strip()
+        
+        try:
+            if len(start_input) <= 5:
+                hour, minute = (int(value) for value in start_input.split(':'))
+                start_at = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+            else:
+                start_at = datetime.strptime(start_input, "%Y-%m-%d %H:%M")
+        except ValueError:
+            print("❌ Invalid time!")
+            return
+            
+        if start_at <= datetime.now():
+            print("❌ Start time must be in the future.")
+            return
+            
+        task_id = None
+        task_input = input("Task ID to work on (leave empty for none): ").strip()
+        if task_input:
+            if not task_input.isdigit() or not self.task_manager.get_task(int(task_input)):
+                print("❌ Task not found!")
+                return
+            task_id = int(task_input)
+            
+        session = self.scheduler.schedule_session(start_at, task_id, self.task_lists.active_name)
+        print(f"✅ Focus session scheduled for {start_at.strftime('%Y-%m-%d %H:%M')} (ID: {session.id})")
+        
+    def display_schedules(self):
+        """Display recurring tasks and scheduled sessions"""
+        if not self.scheduler.rules and not self.scheduler.sessions:
+            print("\n📭 Nothing scheduled!")
+            return
+            
+        if self.scheduler.rules:
+            print("\n🔁 RECURRING TASKS:")
+            for recurring in self.scheduler.rules.values():
+                next_run = datetime.fromisoformat(recurring.next_run).strftime("%Y-%m-%d %H:%M")
+                print(f"{recurring.id:<4} {recurring.title[:25]:<25} {recurring.rule:<20} "
+                      f"next: {next_run}  [{recurring.task_list}]")
+                
+        if self.scheduler.sessions:
+            print("\n⏰ SCHEDULED SESSIONS:")
+            for session in sorted(self.scheduler.sessions.values(), key=lambda s: s.start_at):
+                start_at = datetime.fromisoformat(session.start_at).strftime("%Y-%m-%d %H:%M")
+                task_manager = self.task_lists.get(session.task_list)
+                task = task_manager.get_task(session.task_id) if session.task_id else None
+                print(f"{session.id:<4} {start_at}  {task.title if task else '(no task)'}  [{session.task_list}]")
+                
+    def remove_schedule_interactive(self):
+        """Interactive schedule removal"""
+        self.display_schedules()
+        
+        try:
+            schedule_id = int(input("\nEnter schedule ID to remove: "))
+            if self.scheduler.remove(schedule_id):
+                print("✅ Schedule removed successfully!")
+            else:
+                print("❌ Schedule not found!")
+        except ValueError:
+            print("❌ Invalid schedule ID!")
+            
+    def display_lists(self):
+        """Display every task list with its counts, read from the catalog"""
+        print("\n📚 TASK LISTS:")
+        print(f"  {'Name':<20} {'To Do':>6} {'Active':>7} {'Done':>6} {'Archived':>9}")
+        for name in self.task_lists.names():
+            counts = self.task_lists.counts(name)
+            marker = "▶" if name == self.task_lists.active_name else " "
+            print(f"{marker} {name[:20]:<20} {counts.get('todo', 0):>6} {counts.get('in_progress', 0):>7} "
+                  f"{counts.get('completed', 0):>6} {counts.get('archived', 0):>9}")
+                  
+    def switch_list_interactive(self):
+        """Interactive task list switch"""
+        self.display_lists()
+        name = input("\nList to switch to: ").strip()
+        if name not in self.task_lists.lists:
+            print("❌ List not found!")
+            return
+        self.task_lists.switch(name)
+        print(f"✅ Now working in '{name}'")
+        
+    def create_list_interactive(self):
+        """Interactive task list creation"""
+        name = input("\nNew list name: ").strip()
+        try:
+            if not self.task_lists.create_list(name):
+                print("❌ A list with that name already exists!")
+                return
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ List '{name}' created!")
+        if input("Switch to it now? (y/N): ").strip().lower() == 'y':
+            self.task_lists.switch(name)
+            
+    def delete_list_interactive(self):
+        """Interactive task list deletion"""
+        self.display_lists()
+        name = input("\nList to delete: ").strip()
+        if name == DEFAULT_LIST:
+            print("❌ The default list can't be deleted.")
+            return
+        if name not in self.task_lists.lists:
+            print("❌ List not found!")
+            return
+            
+        confirm = input(f"Delete '{name}' and all of its tasks? (y/N): ")
+        if confirm.lower() == 'y':
+            self.task_lists.delete_list(name)
+            self.scheduler.remove_list(name)
+            print("✅ List deleted!")
+        else:
+            print("ℹ️ List deletion cancelled.")
+            
+    def search_all_lists_interactive(self):
+        """Run a query over every task list"""
+        print("\n🔎 SEARCH ALL LISTS:")
+        text = input("Query: ").strip()
+        if not text:
+            return
+            
+        try:
+            results = self.task_lists.query_all(text)
+        except QueryError as e:
+            print(f"❌ {e}")
+            return
+            
+        if not results:
+            print("\n📭 No tasks found!")
+            return
+        for name in self.task_lists.names():
+            tasks = [task for list_name, task in results if list_name == name]
+            if tasks:
+                print(f"\n📚 {name}:")
+                self.display_tasks(tasks, self.task_lists.get(name))
+                
     def display_statistics(self):
         """Display task and session statistics"""
         tasks = self.task_manager.tasks
-        completed_tasks = self.task_manager.get_tasks_by_status(TaskStatus.COMPLETED)
+        archived_count = self.task_manager.archive.total_count()
+        completed_count = self.task_manager.completed_count()
         todo_tasks = self.task_manager.get_tasks_by_status(TaskStatus.TODO)
         in_progress_tasks = self.task_manager.get_tasks_by_status(TaskStatus.IN_PROGRESS)
         
         print("\n📊 STATISTICS:")
         print("-" * 40)
-        print(f"📋 Total Tasks: {len(tasks)}")
-        print(f"✅ Completed: {len(completed_tasks)}")
+        print(f"📋 Total Tasks: {len(tasks) + archived_count}")
+        print(f"✅ Completed: {completed_count} ({archived_count} archived)")
         print(f"⏳ To Do: {len(todo_tasks)}")
         print(f"🔄 In Progress: {len(in_progress_tasks)}")
         print(f"⚡ Focus Sessions Today: {self.timer.session_count}")
         
-        if tasks:
-            completion_rate = len(completed_tasks) / len(tasks) * 100
+        if tasks or archived_count:
+            completion_rate = completed_count / (len(tasks) + archived_count) * 100
             print(f"📈 Completion Rate: {completion_rate:.1f}%")
             
+        tag_counts = self.task_manager.tag_counts()
+        if tag_counts:
+            open_counts = dict(self.task_manager.tag_counts(open_only=True))
+            print("\n🏷️  Tags:")
+            for tag, count in tag_counts[:10]:
+                print(f"  #{tag}: {count} tasks ({open_counts.get(tag, 0)} open)")
+            if len(tag_counts) > 10:
+                print(f"  ... and {len(tag_counts) - 10} more")
+            
+        hook_stats = {name: stats for name, stats in self.hooks.stats.items()
+                      if stats.calls or stats.skipped or stats.cancelled}
+        if hook_stats or self.hooks.dropped_events:
+            print("\n🪝 Session Hooks:")
+            for name, stats in hook_stats.items():
+                print(f"  {name}: {stats.calls} calls, avg {stats.avg_seconds * 1000:.1f} ms, "
+                      f"max {stats.max_seconds * 1000:.1f} ms, {stats.timeouts} timeouts, {stats.errors} errors, "
+                      f"{stats.skipped} skipped, {stats.cancelled} cancelled")
+            if self.hooks.dropped_events:
+                print(f"  ⚠️ Dropped events: {self.hooks.dropped_events}")
+                
+        if len(self.task_lists.lists) > 1:
+            totals = {}
+            for name in self.task_lists.names():
+                for key, count in self.task_lists.counts(name).items():
+                    totals[key] = totals.get(key, 0) + count
+            print(f"\n📚 All Lists ({len(self.task_lists.lists)}):")
+            print(f"  📋 Total Tasks: {sum(totals.values())}")
+            print(f"  ✅ Completed: {totals.get('completed', 0) + totals.get('archived', 0)}")
+            print(f"  ⏳ To Do: {totals.get('todo', 0)}")
+            print(f"  🔄 In Progress: {totals.get('in_progress', 0)}")
+            by_priority = self.task_lists.priority_counts_all()
+            print("  🎯 Open by priority: " +
+                  ", ".join(f"{priority.name.title()} {count}" for priority, count in by_priority.items()))
+            
     def display_settings(self):
         """Display and modify settings"""
         print("\n⚙️ SETTINGS:")
@@ -336,16 +748,17 @@ class PomodoroApp:
         self.display_banner()
         
         while True:
-            self.display_main_menu()
-            
             try:
-                choice = input("\nEnter your choice (1-5): ").strip()
+                self.check_schedules()
+                self.display_main_menu()
+                
+                choice = input("\nEnter your choice (1-7): ").strip()
                 
                 if choice == '1':
                     # Task Management
                     while True:
                         self.display_task_menu()
-                        task_choice = input("\nEnter your choice (1-7): ").strip()
+                        task_choice = input("\nEnter your choice (1-10): ").strip()
                         
                         if task_choice == '1':
                             self.add_task_interactive()
@@ -373,6 +786,27 @@ class PomodoroApp:
                             except ValueError:
                                 print("❌ Invalid task ID!")
                         elif task_choice == '7':
+                            self.view_archive_interactive()
+                        elif task_choice == '8':
+                            self.search_tasks_interactive()
+                        elif task_choice == '9':
+                            while True:
+                                self.display_dependency_menu()
+                                dependency_choice = input("\nEnter your choice (1-5): ").strip()
+                                
+                                if dependency_choice == '1':
+                                    self.add_subtask_interactive()
+                                elif dependency_choice == '2':
+                                    self.add_dependency_interactive()
+                                elif dependency_choice == '3':
+                                    self.remove_dependency_interactive()
+                                elif dependency_choice == '4':
+                                    self.display_tasks(self.task_manager.get_ready_tasks())
+                                elif dependency_choice == '5':
+                                    break
+                                else:
+                                    print("❌ Invalid choice!")
+                        elif task_choice == '10':
                             break
                         else:
                             print("❌ Invalid choice!")
@@ -387,22 +821,56 @@ class PomodoroApp:
                     self.display_statistics()
                     
                 elif choice == '5':
+                    while True:
+                        self.display_schedule_menu()
+                        schedule_choice = input("\nEnter your choice (1-5): ").strip()
+                        
+                        if schedule_choice == '1':
+                            self.add_recurring_task_interactive()
+                        elif schedule_choice == '2':
+                            self.schedule_session_interactive()
+                        elif schedule_choice == '3':
+                            self.display_schedules()
+                        elif schedule_choice == '4':
+                            self.remove_schedule_interactive()
+                        elif schedule_choice == '5':
+                            break
+                        else:
+                            print("❌ Invalid choice!")
+                            
+                elif choice == '6':
+                    while True:
+                        self.display_lists_menu()
+                        lists_choice = input("\nEnter your choice (1-6): ").strip()
+                        
+                        if lists_choice == '1':
+                            self.display_lists()
+                        elif lists_choice == '2':
+                            self.switch_list_interactive()
+                        elif lists_choice == '3':
+                            self.create_list_interactive()
+                        elif lists_choice == '4':
+                            self.delete_list_interactive()
+                        elif lists_choice == '5':
+                            self.search_all_lists_interactive()
+                        elif lists_choice == '6':
+                            break
+                        else:
+                            print("❌ Invalid choice!")
+                            
+                elif choice == '7':
                     print("\n👋 Thank you for using Pomodoro Task Manager!")
                     print("Stay productive!")
                     break
                     
                 else:
-                    print("❌ Invalid choice! Please enter 1-5.")
+                    print("❌ Invalid choice! Please enter 1-7.")
                     
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
                 break
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
-
-
-
-
-
-
-
+                
+        # Let queued session hooks (task updates, logs) finish before exiting
+        self.hooks.shutdown()
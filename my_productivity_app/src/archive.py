@@ -0,0 +1,142 @@
+import json
+import lzma
+import os
+from typing import Dict, Iterator, List, Optional, Set
+
+import config
+
+
+class TaskArchive:
+    """Cold storage for completed tasks.
+
+    Tasks are appended to compressed segment files partitioned by the month
+    they were completed in (``2025-07.jsonl.xz``). Only a small summary index
+    is read eagerly; segments are opened when history is actually requested.
+
+    Months touched by an archive run are recorded in a pending file until the
+    caller has saved its hot file. If that never happens, the next start
+    recounts those months from their segments and skips the tasks already
+    stored there, so a crash can't archive the same task twice.
+    """
+
+    def __init__(self, archive_dir: str = config.ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.index_file = os.path.join(archive_dir, 'index.json')
+        self.pending_file = os.path.join(archive_dir, 'pending.json')
+        self.index: Dict[str, Dict] = {}
+        self.load_index()
+        self._stored_ids = self._recover_pending()
+
+    def segment_path(self, month: str) -> str:
+        """Path of the segment holding tasks completed in ``month`` (YYYY-MM)"""
+        return os.path.join(self.archive_dir, f"{month}.jsonl.xz")
+
+    def _pending_months(self) -> List[str]:
+        if not os.path.exists(self.pending_file):
+            return []
+        with open(self.pending_file, 'r') as f:
+            return json.load(f)
+
+    def _recover_pending(self) -> Set[int]:
+        """Recount months left pending by an interrupted run; returns the task IDs stored in them"""
+        try:
+            stored = set()
+            months = self._pending_months()
+            for month in months:
+                summary = {'count': 0, 'by_priority': {}}
+                for task_dict in self.iter_tasks(month):
+                    stored.add(task_dict['id'])
+                    summary['count'] += 1
+                    key = str(task_dict['priority'])
+                    summary['by_priority'][key] = summary['by_priority'].get(key, 0) + 1
+                if summary['count']:
+                    self.index[month] = summary
+            if months:
+                self.save_index()
+            return stored
+        except Exception as e:
+            print(f"Error recovering archive: {e}")
+            return set()
+
+    def clear_pending(self):
+        """Mark the last archive run as complete once the caller's hot file is saved"""
+        self._stored_ids = set()
+        if os.path.exists(self.pending_file):
+            os.remove(self.pending_file)
+
+    def archive(self, task_dicts: List[Dict]) -> int:
+        """Append serialized tasks to their monthly segments, skipping ones already stored"""
+        by_month: Dict[str, List[Dict]] = {}
+        for task_dict in task_dicts:
+            if task_dict['id'] not in self._stored_ids:
+                by_month.setdefault(task_dict['completed_at'][:7], []).append(task_dict)
+
+        if not by_month:
+            return 0
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        pending = sorted(set(by_month) | set(self._pending_months()))
+        with open(self.pending_file, 'w') as f:
+            json.dump(pending, f)
+        for month, month_tasks in sorted(by_month.items()):
+            # Each append writes a new xz stream; lzma reads concatenated streams back
+            with lzma.open(self.segment_path(month), 'at', encoding='utf-8') as f:
+                for task_dict in month_tasks:
+                    f.write(json.dumps(task_dict) + "\n")
+
+            summary = self.index.setdefault(month, {'count': 0, 'by_priority': {}})
+            summary['count'] += len(month_tasks)
+            for task_dict in month_tasks:
+                key = str(task_dict['priority'])
+                summary['by_priority'][key] = summary['by_priority'].get(key, 0) + 1
+            self._stored_ids.update(task_dict['id'] for task_dict in month_tasks)
+
+        self.save_index()
+        return sum(len(month_tasks) for month_tasks in by_month.values())
+
+    def iter_tasks(self, month: Optional[str] = None) -> Iterator[Dict]:
+        """Yield archived task dicts, optionally limited to a single month"""
+        months = [month] if month else self.months()
+        for m in months:
+            path = self.segment_path(m)
+            if not os.path.exists(path):
+                continue
+            with lzma.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def months(self) -> List[str]:
+        """Archived months, oldest first"""
+        return sorted(self.index)
+
+    def total_count(self) -> int:
+        """Number of archived tasks, read from the index only"""
+        return sum(summary['count'] for summary in self.index.values())
+
+    def count_by_priority(self) -> Dict[int, int]:
+        """Archived task counts per priority value, read from the index only"""
+        counts: Dict[int, int] = {}
+        for summary in self.index.values():
+            for priority, count in summary['by_priority'].items():
+                counts[int(priority)] = counts.get(int(priority), 0) + count
+        return counts
+
+    def save_index(self):
+        """Save the summary index"""
+        try:
+            tmp_file = self.index_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(self.index, f, indent=2)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"Error saving archive index: {e}")
+
+    def load_index(self):
+        """Load the summary index"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    self.index = json.load(f)
+        except Exception as e:
+            print(f"Error loading archive index: {e}")
@@ -0,0 +1,158 @@
+import argparse
+import os
+from typing import List, Optional
+
+import config
+from .task_manager import TaskManager, Priority, TaskStatus
+from .snapshot import TaskSnapshot
+from .query import QueryError, parse_query, plan_query
+from .task_lists import TaskListCatalog
+
+
+def _list_name(args, task_lists: TaskListCatalog) -> str:
+    """List selected with --list, defaulting to the active one"""
+    name = args.list or task_lists.active_name
+    if name not in task_lists.lists:
+        raise SystemExit(f"❌ Unknown task list: {name}")
+    return name
+
+
+def _task_manager(args) -> TaskManager:
+    task_lists = TaskListCatalog()
+    return task_lists.get(_list_name(args, task_lists))
+
+
+def _open_snapshot(args) -> Optional[TaskSnapshot]:
+    """Snapshot for read-only commands, or None when the store is JSON"""
+    task_lists = TaskListCatalog()
+    data_file, _archive_dir = task_lists.shard_paths(_list_name(args, task_lists))
+    if data_file.endswith('.snap') and os.path.exists(data_file):
+        return TaskSnapshot(data_file)
+    return None
+
+
+def print_rows(rows):
+    """Print (id, title, priority, status, created_at) rows as a table"""
+    print(f"{'ID':<6} {'Title':<25} {'Priority':<9} {'Status':<12} {'Created':<10}")
+    print("-" * 66)
+    count = 0
+    for task_id, title, priority, status, created_at in rows:
+        print(f"{task_id:<6} {title[:25]:<25} {priority.name:<9} {status.value:<12} {(created_at or '')[:10]:<10}")
+        count += 1
+    print(f"\n{count} task(s)")
+
+
+def cmd_list(args) -> int:
+    status = TaskStatus(args.status) if args.status else None
+    priority = Priority[args.priority.upper()] if args.priority else None
+
+    snapshot = _open_snapshot(args)
+    if snapshot:
+        with snapshot:
+            print_rows(snapshot.row(i) for i in snapshot.matching_indexes(status, priority))
+        return 0
+
+    task_manager = _task_manager(args)
+    print_rows((task.id, task.title, task.priority, task.status, task.created_at)
+               for task in task_manager.tasks
+               if (status is None or task.status == status)
+               and (priority is None or task.priority == priority))
+    return 0
+
+
+def cmd_stats(args) -> int:
+    snapshot = _open_snapshot(args)
+    if snapshot:
+        with snapshot:
+            by_status = snapshot.count_by_status()
+    else:
+        task_manager = _task_manager(args)
+        by_status = {status: len(task_manager.get_tasks_by_status(status)) for status in TaskStatus}
+
+    print(f"📋 Total Tasks: {sum(by_status.values())}")
+    print(f"✅ Completed: {by_status[TaskStatus.COMPLETED]}")
+    print(f"⏳ To Do: {by_status[TaskStatus.TODO]}")
+    print(f"🔄 In Progress: {by_status[TaskStatus.IN_PROGRESS]}")
+    return 0
+
+
+def cmd_lists(args) -> int:
+    task_lists = TaskListCatalog()
+    print(f"{'Name':<20} {'To Do':>6} {'Active':>7} {'Done':>6} {'Archived':>9}")
+    for name in task_lists.names():
+        counts = task_lists.counts(name)
+        marker = "*" if name == task_lists.active_name else " "
+        print(f"{marker}{name[:19]:<19} {counts.get('todo', 0):>6} {counts.get('in_progress', 0):>7} "
+              f"{counts.get('completed', 0):>6} {counts.get('archived', 0):>9}")
+    return 0
+
+
+def cmd_query(args) -> int:
+    try:
+        query = parse_query(" ".join(args.query))
+    except QueryError as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.all_lists:
+        task_lists = TaskListCatalog()
+        results = task_lists.query_all(" ".join(args.query))
+        for name in task_lists.names():
+            tasks = [task for list_name, task in results if list_name == name]
+            if tasks:
+                print(f"\n📚 {name}")
+                print_rows((task.id, task.title, task.priority, task.status, task.created_at) for task in tasks)
+        return 0
+
+    plan = plan_query(query, _task_manager(args))
+    if args.explain:
+        print(plan.explain())
+        return 0
+    print_rows((task.id, task.title, task.priority, task.status, task.created_at)
+               for task in plan.execute())
+    return 0
+
+
+def cmd_export(args) -> int:
+    _task_manager(args).export_json(args.path)
+    print(f"✅ Exported tasks to {args.path}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='main.py', description=config.APP_NAME)
+    parser.add_argument('--list', help='Task list to use (defaults to the active list)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    list_parser = subparsers.add_parser('list', help='List tasks')
+    list_parser.add_argument('--status', choices=[status.value for status in TaskStatus])
+    list_parser.add_argument('--priority', choices=[priority.name.lower() for priority in Priority])
+    list_parser.set_defaults(func=cmd_list)
+
+    stats_parser = subparsers.add_parser('stats', help='Show task counts')
+    stats_parser.set_defaults(func=cmd_stats)
+
+    query_parser = subparsers.add_parser('query', help='Search tasks, e.g. "status:todo priority>=2 sort:-priority limit:10"')
+    query_parser.add_argument('query', nargs='+')
+    query_parser.add_argument('--explain', action='store_true', help='Show the query plan instead of results')
+    query_parser.add_argument('--all-lists', action='store_true', help='Search every task list')
+    query_parser.set_defaults(func=cmd_query)
+
+    lists_parser = subparsers.add_parser('lists', help='Show task lists and their counts')
+    lists_parser.set_defaults(func=cmd_lists)
+
+    export_parser = subparsers.add_parser('export', help='Export tasks as JSON')
+    export_parser.add_argument('path')
+    export_parser.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def run_cli(argv: List[str]) -> int:
+    """Run a non-interactive command"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+    return args.func(args)
@@ -0,0 +1,172 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a new dependency would make tasks wait on each other"""
+
+
+class DependencyGraph:
+    """Dependency edges between tasks, with an incrementally maintained ready set.
+
+    An edge ``dependency -> task`` means the task waits for the dependency.
+    A topological order is kept up to date on every insert (Pearce-Kelly),
+    so cycle checks only search the part of the graph between the two
+    endpoints. Each task tracks how many of its dependencies are unfinished;
+    finishing a task only touches its direct dependents.
+    """
+
+    def __init__(self):
+        self.dependencies: Dict[int, Set[int]] = {}
+        self.dependents: Dict[int, Set[int]] = {}
+        self.order: Dict[int, int] = {}
+        self.blocked_count: Dict[int, int] = {}
+        self.done: Set[int] = set()
+        self.todo: Set[int] = set()
+        self.ready: Set[int] = set()
+        self._next_order = 0
+
+    def rebuild(self, nodes: Iterable[Tuple[int, bool, bool, List[int]]]):
+        """Rebuild from (task_id, done, todo, depends_on) tuples"""
+        self.__init__()
+        nodes = list(nodes)
+        for task_id, done, todo, _depends_on in nodes:
+            self.dependencies[task_id] = set()
+            self.dependents[task_id] = set()
+            self.blocked_count[task_id] = 0
+            if done:
+                self.done.add(task_id)
+            if todo:
+                self.todo.add(task_id)
+        for task_id, _done, _todo, depends_on in nodes:
+            for dependency in depends_on:
+                # Dependencies that were archived or removed count as finished
+                if dependency in self.dependents and dependency != task_id:
+                    self.dependencies[task_id].add(dependency)
+                    self.dependents[dependency].add(task_id)
+                    if dependency not in self.done:
+                        self.blocked_count[task_id] += 1
+
+        # Kahn's algorithm gives the initial topological order
+        waiting = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        queue = [task_id for task_id, count in waiting.items() if count == 0]
+        while queue:
+            task_id = queue.pop()
+            self._assign_order(task_id)
+            for dependent in self.dependents[task_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    queue.append(dependent)
+        if len(self.order) < len(self.dependencies):
+            # Only possible with hand-edited data; keep going with an arbitrary order for those tasks
+            print("Warning: circular task dependencies found in saved data")
+            for task_id in self.dependencies:
+                if task_id not in self.order:
+                    self._assign_order(task_id)
+
+        for task_id in self.dependencies:
+            self._update_ready(task_id)
+
+    def _assign_order(self, task_id: int):
+        self.order[task_id] = self._next_order
+        self._next_order += 1
+
+    def _update_ready(self, task_id: int):
+        if task_id in self.todo and self.blocked_count[task_id] == 0:
+            self.ready.add(task_id)
+        else:
+            self.ready.discard(task_id)
+
+    def add_node(self, task_id: int, done: bool = False, todo: bool = True):
+        self.dependencies[task_id] = set()
+        self.dependents[task_id] = set()
+        self.blocked_count[task_id] = 0
+        self._assign_order(task_id)
+        if done:
+            self.done.add(task_id)
+        if todo:
+            self.todo.add(task_id)
+        self._update_ready(task_id)
+
+    def remove_node(self, task_id: int):
+        """Drop a task; its dependents stop waiting on it"""
+        for dependency in list(self.dependencies[task_id]):
+            self.remove_edge(dependency, task_id)
+        for dependent in list(self.dependents[task_id]):
+            self.remove_edge(task_id, dependent)
+        for index in (self.dependencies, self.dependents, self.order, self.blocked_count):
+            del index[task_id]
+        self.done.discard(task_id)
+        self.todo.discard(task_id)
+        self.ready.discard(task_id)
+
+    def add_edge(self, dependency: int, task_id: int):
+        """Make ``task_id`` wait for ``dependency``; raises DependencyCycleError on a cycle"""
+        if dependency == task_id:
+            raise DependencyCycleError("A task can't depend on itself")
+        if dependency in self.dependencies[task_id]:
+            return
+
+        lower, upper = self.order[task_id], self.order[dependency]
+        if lower < upper:
+            # The edge points backwards in the current order: search only the affected range
+            forward = self._search(task_id, self.dependents, lambda o: o <= upper, dependency)
+            backward = self._search(dependency, self.dependencies, lambda o: o >= lower)
+            self._reorder(backward, forward)
+
+        self.dependencies[task_id].add(dependency)
+        self.dependents[dependency].add(task_id)
+        if dependency not in self.done:
+            self.blocked_count[task_id] += 1
+            self._update_ready(task_id)
+
+    def _search(self, start: int, edges: Dict[int, Set[int]], in_range, forbidden: int = None) -> List[int]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbour in edges[node]:
+                if neighbour == forbidden:
+                    raise DependencyCycleError("That dependency would create a cycle")
+                if neighbour not in seen and in_range(self.order[neighbour]):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return list(seen)
+
+    def _reorder(self, backward: List[int], forward: List[int]):
+        """Reuse the affected nodes' order slots, placing the backward set first"""
+        backward.sort(key=self.order.__getitem__)
+        forward.sort(key=self.order.__getitem__)
+        slots = sorted(self.order[node] for node in backward + forward)
+        for node, slot in zip(backward + forward, slots):
+            self.order[node] = slot
+
+    def remove_edge(self, dependency: int, task_id: int):
+        if dependency not in self.dependencies[task_id]:
+            return
+        self.dependencies[task_id].discard(dependency)
+        self.dependents[dependency].discard(task_id)
+        if dependency not in self.done:
+            self.blocked_count[task_id] -= 1
+            self._update_ready(task_id)
+
+    def set_state(self, task_id: int, done: bool, todo: bool):
+        """Record a status change; dependents are updated in O(out-degree)"""
+        was_done = task_id in self.done
+        if done != was_done:
+            delta = -1 if done else 1
+            for dependent in self.dependents[task_id]:
+                self.blocked_count[dependent] += delta
+                self._update_ready(dependent)
+        if done:
+            self.done.add(task_id)
+        else:
+            self.done.discard(task_id)
+        if todo:
+            self.todo.add(task_id)
+        else:
+            self.todo.discard(task_id)
+        self._update_ready(task_id)
+
+    def blockers(self, task_id: int) -> List[int]:
+        """Unfinished dependencies of a task"""
+        return sorted(dependency for dependency in self.dependencies[task_id] if dependency not in self.done)
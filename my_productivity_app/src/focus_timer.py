@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 import sys
 
+from .hooks import HookDispatcher, SESSION_START, SESSION_COMPLETE, SESSION_PAUSE, SESSION_STOP
+
 class PomodoroSettings:
     def __init__(self):
         self.focus_duration = 25 * 60  # 25 minutes in seconds
@@ -11,21 +13,25 @@ class PomodoroSettings:
         self.sessions_before_long_break = 4
 
 class PomodoroTimer:
-    def __init__(self, settings: PomodoroSettings):
+    def __init__(self, settings: PomodoroSettings, hooks: Optional[HookDispatcher] = None):
         self.settings = settings
+        self.hooks = hooks
         self.session_count = 0
         self.is_running = False
         self.current_session = None
         self.paused = False
         self.remaining_time = 0
         
-    def start_focus_session(self, task_id: Optional[int] = None, on_complete_callback=None):
-        """Start a focus session"""
+    def start_focus_session(self, task_id: Optional[int] = None, on_complete_callback=None,
+                            task_list: Optional[str] = None):
+        """Start a focus session; ``task_list`` names the list ``task_id`` belongs to"""
         self.current_session = {
             'type': 'focus',
             'duration': self.settings.focus_duration,
-            'task_id': task_id
+            'task_id': task_id,
+            'task_list': task_list
         }
+        self._emit(SESSION_START)
         self._start_timer(on_complete_callback)
         
     def start_break_session(self, on_complete_callback=None):
@@ -40,10 +46,17 @@ class PomodoroTimer:
         self.current_session = {
             'type': session_type,
             'duration': duration,
-            'task_id': None
+            'task_id': None,
+            'task_list': None
         }
+        self._emit(SESSION_START)
         self._start_timer(on_complete_callback)
         
+    def _emit(self, event: str):
+        """Hand a session event to the hook dispatcher without waiting for the hooks"""
+        if self.hooks:
+            self.hooks.emit(event, self.current_session)
+        
     def _start_timer(self, on_complete_callback=None):
         """Internal timer logic"""
         self.is_running = True
@@ -72,6 +85,7 @@ class PomodoroTimer:
     def _session_complete(self, on_complete_callback=None):
         """Handle session completion"""
         print(f"\n\n✅ {self.current_session['type'].replace('_', ' ').title()} Complete!")
+        self._emit(SESSION_COMPLETE)
         
         if self.current_session['type'] == 'focus':
             self.session_count += 1
@@ -93,6 +107,7 @@ class PomodoroTimer:
     def _handle_interrupt(self):
         """Handle Ctrl+C gracefully"""
         self.paused = True
+        self._emit(SESSION_PAUSE)
         print("\n\n⏸️  Timer paused. What would you like to do?")
         print("1. Resume")
         print("2. Stop session")
@@ -105,6 +120,7 @@ class PomodoroTimer:
         else:
             self.is_running = False
             self.paused = False
+            self._emit(SESSION_STOP)
             print("Session stopped.")
             # Reset current session if stopped
             self.current_session = None
\ No newline at end of file
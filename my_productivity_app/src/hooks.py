@@ -0,0 +1,223 @@
+import itertools
+import os
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import config
+
+
+# Session events emitted by PomodoroTimer
+SESSION_START = 'session_start'
+SESSION_COMPLETE = 'session_complete'
+SESSION_PAUSE = 'session_pause'
+SESSION_STOP = 'session_stop'
+SESSION_EVENTS = (SESSION_START, SESSION_COMPLETE, SESSION_PAUSE, SESSION_STOP)
+
+# A hook receives the event name and a copy of the session dict
+Hook = Callable[[str, Dict], None]
+
+
+@dataclass
+class HookStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    skipped: int = 0     # the hook was still busy with earlier calls
+    cancelled: int = 0   # timed out before it got to start
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class _HookRunner:
+    """Threads for one hook, bounded so a stuck hook can only hold up itself"""
+
+    def __init__(self, name: str, max_concurrent: int):
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix=f'hook-{name}')
+
+
+@dataclass
+class _Registration:
+    name: str
+    hook: Hook
+    timeout: float
+    runner: _HookRunner
+
+
+class HookDispatcher:
+    """Runs session hooks off the timer thread.
+
+    Events are queued onto a fixed set of worker threads; all events for the
+    same task go to the same worker, so a task's hooks run in emit order.
+    Each queue is bounded: when a worker falls behind, ``emit`` waits briefly
+    and then drops the event rather than stalling the timer.
+
+    Each hook runs on its own small thread pool with a per-hook timeout,
+    measured from when the call actually starts. A call that overruns is
+    not killed, but it keeps holding one of the hook's slots (one by
+    default): until it finishes, later calls to that hook are skipped rather
+    than queued behind it or run alongside it. Other hooks are unaffected.
+    """
+
+    def __init__(self, workers: int = config.HOOK_WORKERS, queue_size: int = config.HOOK_QUEUE_SIZE,
+                 timeout: float = config.HOOK_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self.hooks: Dict[str, List[_Registration]] = {event: [] for event in SESSION_EVENTS}
+        self.stats: Dict[str, HookStats] = {}
+        self.dropped_events = 0
+        self._stats_lock = threading.Lock()
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        # Hook bodies run on per-hook runners so a worker can stop waiting on one that overruns
+        self._runners: Dict[str, _HookRunner] = {}
+        self._round_robin = itertools.cycle(range(workers))
+        self._workers = [
+            threading.Thread(target=self._work, args=(q,), name=f'hook-worker-{i}', daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def register(self, event: str, hook: Hook, name: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrent: int = config.HOOK_MAX_CONCURRENT):
+        """Register a hook for a session event; a hook registered for several events shares its slots"""
+        if event not in self.hooks:
+            raise ValueError(f"Unknown session event: {event}")
+        name = name or getattr(hook, '__name__', repr(hook))
+        runner = self._runners.get(name)
+        if runner is None:
+            runner = self._runners[name] = _HookRunner(name, max_concurrent)
+        self.hooks[event].append(_Registration(name, hook, timeout or self.timeout, runner))
+        self.stats.setdefault(name, HookStats())
+
+    def emit(self, event: str, session: Optional[Dict]) -> bool:
+        """Queue an event for its hooks; returns False if it had to be dropped"""
+        if not self.hooks.get(event):
+            return True
+        session = dict(session or {})
+        task_id = session.get('task_id')
+        worker = task_id % len(self._queues) if task_id is not None else next(self._round_robin)
+        try:
+            self._queues[worker].put((event, session), timeout=config.HOOK_ENQUEUE_TIMEOUT)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped_events += 1
+            return False
+
+    def _work(self, events: queue.Queue):
+        while True:
+            item = events.get()
+            try:
+                if item is None:
+                    return
+                event, session = item
+                for registration in self.hooks[event]:
+                    self._run(registration, event, session)
+            finally:
+                events.task_done()
+
+    def _record(self, name: str, counter: str):
+        with self._stats_lock:
+            stats = self.stats[name]
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _run(self, registration: _Registration, event: str, session: Dict):
+        runner = registration.runner
+        if not runner.slots.acquire(blocking=False):
+            self._record(registration.name, 'skipped')
+            return
+
+        started = threading.Event()
+        timing = {}
+
+        def call():
+            timing['start'] = time.perf_counter()
+            started.set()
+            try:
+                registration.hook(event, session)
+            finally:
+                timing['end'] = time.perf_counter()
+                runner.slots.release()
+
+        future = runner.executor.submit(call)
+        if not started.wait(timeout=registration.timeout) and future.cancel():
+            runner.slots.release()
+            self._record(registration.name, 'cancelled')
+            return
+        started.wait()
+
+        # The timeout and latency are measured from when the hook started, not from submit
+        error = timed_out = False
+        try:
+            future.result(timeout=max(0.0, timing['start'] + registration.timeout - time.perf_counter()))
+        except FutureTimeoutError:
+            timed_out = True
+        except Exception as e:
+            error = True
+            print(f"\nHook '{registration.name}' failed: {e}")
+        elapsed = timing.get('end', time.perf_counter()) - timing['start']
+
+        with self._stats_lock:
+            stats = self.stats[registration.name]
+            stats.calls += 1
+            stats.errors += error
+            stats.timeouts += timed_out
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+
+    def join(self):
+        """Wait until every queued event has been handled"""
+        for events in self._queues:
+            events.join()
+
+    def shutdown(self):
+        """Finish queued events and stop the workers"""
+        for events in self._queues:
+            events.put(None)
+        for worker in self._workers:
+            worker.join()
+        # Don't wait on hooks that overran their timeout
+        for runner in self._runners.values():
+            runner.executor.shutdown(wait=False)
+
+
+def command_hook(command: List[str]) -> Hook:
+    """Hook that runs a local command, e.g. a desktop notifier.
+
+    The event name is appended as the last argument and session details are
+    passed as POMODORO_* environment variables.
+    """
+    def run_command(event: str, session: Dict):
+        env = dict(os.environ)
+        env.update({
+            'POMODORO_EVENT': event,
+            'POMODORO_SESSION_TYPE': str(session.get('type', '')),
+            'POMODORO_TASK_ID': str(session.get('task_id') or ''),
+            'POMODORO_TASK_LIST': str(session.get('task_list') or ''),
+        })
+        subprocess.run(command + [event], env=env, timeout=config.HOOK_TIMEOUT_SECONDS,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    run_command.__name__ = f"command:{os.path.basename(command[0])}"
+    return run_command
+
+
+def log_hook(path: str = config.SESSION_LOG_FILE) -> Hook:
+    """Hook that appends one line per session event to a log file"""
+    lock = threading.Lock()
+
+    def log_session(event: str, session: Dict):
+        line = (f"{datetime.now().isoformat()}\t{event}\t{session.get('type', '')}"
+                f"\t{session.get('task_id') or ''}\n")
+        with lock, open(path, 'a') as f:
+            f.write(line)
+    return log_session
@@ -0,0 +1,327 @@
+import heapq
+import operator
+import re
+import shlex
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .task_manager import Task, TaskManager, Priority, TaskStatus
+from .tags import normalize_tags
+
+
+# Operators in match order; "field:op value" and "field op value" are both accepted
+TERM_PATTERN = re.compile(r'^(?P<field>[A-Za-z_]+)(?P<op>:>=|:<=|:!=|:>|:<|>=|<=|!=|>|<|:)(?P<value>.*)$')
+OPERATORS = {'>=': '>=', '<=': '<=', '!=': '!=', '>': '>', '<': '<', '': '=='}
+COMPARE = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt}
+
+FIELD_ALIASES = {
+    'created': 'created_at',
+    'completed': 'completed_at',
+    'due': 'due_at',
+    'desc': 'description',
+    'tags': 'tag',
+}
+INT_FIELDS = ('id',)
+TEXT_FIELDS = ('title', 'description')
+DATE_FIELDS = ('created_at', 'completed_at', 'due_at')
+# Fields the tag index keeps bitmaps for
+BITMAP_FIELDS = ('tag', 'status', 'priority')
+
+
+class QueryError(ValueError):
+    """Raised for queries that can't be parsed"""
+
+
+@dataclass
+class Predicate:
+    field: str
+    op: str
+    value: Any
+
+
+@dataclass
+class Query:
+    predicates: List[Predicate] = field(default_factory=list)
+    sort: List[Tuple[str, bool]] = field(default_factory=list)  # (field, descending)
+    limit: Optional[int] = None
+
+
+def _parse_status(text: str) -> TaskStatus:
+    try:
+        return TaskStatus(text.replace('-', '_'))
+    except ValueError:
+        raise QueryError(f"Unknown status '{text}' (use todo, in_progress or completed)")
+
+
+def _parse_priority(text: str) -> Priority:
+    try:
+        return Priority(int(text)) if text.isdigit() else Priority[text.upper()]
+    except (KeyError, ValueError):
+        raise QueryError(f"Unknown priority '{text}' (use 1-3 or low/medium/high)")
+
+
+def _parse_value(field_name: str, op: str, text: str) -> Any:
+    if field_name == 'status':
+        if op not in ('==', '!='):
+            raise QueryError("status only supports ':' and '!='")
+        return [_parse_status(part) for part in text.split(',')]
+    if field_name == 'priority':
+        return [_parse_priority(part) for part in text.split(',')] if op in ('==', '!=') else _parse_priority(text)
+    if field_name == 'tag':
+        if op not in ('==', '!='):
+            raise QueryError("tag only supports ':' and '!='")
+        tags = normalize_tags(text)
+        if not tags:
+            raise QueryError("tag needs a value")
+        return tags
+    if field_name in INT_FIELDS:
+        if not text.isdigit():
+            raise QueryError(f"'{field_name}' needs a number")
+        return int(text)
+    if field_name in TEXT_FIELDS and op not in ('==', '!='):
+        raise QueryError(f"{field_name} only supports ':' and '!='")
+    if field_name in DATE_FIELDS:
+        if not re.match(r'^\d{4}(-\d{2}(-\d{2}(T[\d:.]+)?)?)?$', text):
+            raise QueryError(f"'{field_name}' needs a date like 2025-07-01")
+        return text
+    return text.lower()
+
+
+def parse_query(text: str) -> Query:
+    """Parse query text into a Query.
+
+    Terms are ``field:value``, ``field:<value`` or ``field>=value`` style
+    comparisons, ``sort:[-]field``, ``limit:N`` and bare words, which match
+    the title or description. ``tag:a,b`` matches tasks with either tag,
+    ``tag!=a`` those without it, and repeated terms must all match.
+    """
+    query = Query()
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise QueryError(str(e))
+
+    for term in terms:
+        match = TERM_PATTERN.match(term)
+        if not match:
+            query.predicates.append(Predicate('text', '==', term.lower()))
+            continue
+
+        field_name = match.group('field').lower()
+        field_name = FIELD_ALIASES.get(field_name, field_name)
+        op = OPERATORS[match.group('op').lstrip(':')]
+        value = match.group('value')
+
+        if field_name == 'sort':
+            for part in value.split(','):
+                sort_field = FIELD_ALIASES.get(part.lstrip('-'), part.lstrip('-'))
+                if sort_field not in ('status', 'priority') + INT_FIELDS + TEXT_FIELDS + DATE_FIELDS:
+                    raise QueryError(f"Can't sort by '{part}'")
+                query.sort.append((sort_field, part.startswith('-')))
+        elif field_name == 'limit':
+            if not value.isdigit():
+                raise QueryError("limit needs a number")
+            query.limit = int(value)
+        elif field_name in BITMAP_FIELDS + INT_FIELDS + TEXT_FIELDS + DATE_FIELDS:
+            query.predicates.append(Predicate(field_name, op, _parse_value(field_name, op, value)))
+        else:
+            raise QueryError(f"Unknown field '{match.group('field')}'")
+
+    return query
+
+
+def compile_predicates(predicates: List[Predicate]) -> Optional[Callable[[Task], bool]]:
+    """Compile predicates into one function evaluating them all in a single expression"""
+    if not predicates:
+        return None
+
+    namespace: Dict[str, Any] = {}
+    clauses = []
+    for i, predicate in enumerate(predicates):
+        name = f"v{i}"
+        attr = f"t.{predicate.field}"
+        op = predicate.op
+        if predicate.field in ('status', 'priority') and isinstance(predicate.value, list):
+            namespace[name] = frozenset(predicate.value)
+            clauses.append(f"({attr} {'not in' if op == '!=' else 'in'} {name})")
+            continue
+        if predicate.field == 'tag':
+            namespace[name] = frozenset(predicate.value)
+            clauses.append(f"({'' if op == '!=' else 'not '}{name}.isdisjoint(t.tags))")
+            continue
+        if predicate.field == 'priority':
+            namespace[name] = predicate.value.value
+            clauses.append(f"({attr}.value {op} {name})")
+            continue
+        namespace[name] = predicate.value
+        if predicate.field == 'text':
+            clauses.append(f"({name} in t.title.lower() or {name} in t.description.lower())")
+        elif predicate.field in TEXT_FIELDS:
+            clauses.append(f"({name} {'not in' if op == '!=' else 'in'} {attr}.lower())")
+        elif predicate.field in DATE_FIELDS and op in ('==', '!='):
+            # A date matches every timestamp that starts with it
+            clauses.append(f"({'not ' if op == '!=' else ''}({attr} or '').startswith({name}))")
+        elif predicate.field in DATE_FIELDS:
+            if op in ('<=', '>'):
+                # Compare past the end of the given day/month so "<=2025-07-01" includes July 1st
+                namespace[name] = predicate.value + '~'
+            clauses.append(f"({attr} is not None and {attr} {op} {name})")
+        else:
+            clauses.append(f"({attr} {op} {name})")
+
+    source = "lambda t: " + " and ".join(clauses)
+    return eval(compile(source, '<query>', 'eval'), namespace)
+
+
+class _Descending:
+    """Sort key wrapper that inverts ordering"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other) -> bool:
+        return self.value == other.value
+
+
+def sort_key(sort: List[Tuple[str, bool]],
+             position: Optional[Callable[[int], int]] = None) -> Callable[[Task], tuple]:
+    """Key function for a query's sort, with list position (if given) as the tie-breaker"""
+    def value(task: Task, field_name: str):
+        raw = getattr(task, field_name)
+        if field_name in ('status', 'priority'):
+            raw = raw.value
+        # Missing dates sort last in either direction
+        return (raw is None, raw if raw is not None else '')
+
+    def key(task: Task) -> tuple:
+        parts = []
+        for field_name, descending in sort:
+            missing, raw = value(task, field_name)
+            parts.append((missing, _Descending(raw) if descending else raw))
+        if position:
+            parts.append(position(task.id))
+        return tuple(parts)
+
+    return key
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, list):
+        return ",".join(_format_value(item) for item in value)
+    if isinstance(value, Priority):
+        return value.name.lower()
+    if isinstance(value, TaskStatus):
+        return value.value
+    return str(value)
+
+
+@dataclass
+class QueryPlan:
+    query: Query
+    task_manager: TaskManager
+    source: str
+    candidates: Callable[[], Iterable[Task]]
+    ordered: bool
+    residual: List[Predicate]
+    estimated_rows: int
+
+    def explain(self) -> str:
+        """Human-readable description of the plan"""
+        residual = ", ".join(f"{p.field} {p.op} {_format_value(p.value)}" for p in self.residual) or "none"
+        lines = [f"source: {self.source} (~{self.estimated_rows} rows)", f"filter: {residual}"]
+        if self.query.sort:
+            lines.append("sort: " + ", ".join(('-' if d else '') + f for f, d in self.query.sort))
+        if self.query.limit is not None:
+            lines.append(f"limit: {self.query.limit}")
+        return "\n".join(lines)
+
+    def execute(self) -> Iterator[Task]:
+        """Stream matching tasks; without a sort, the limit stops the scan early"""
+        candidates = self.candidates()
+        match = compile_predicates(self.residual)
+        if match:
+            candidates = filter(match, candidates)
+
+        limit = self.query.limit
+        if self.query.sort or not self.ordered:
+            key = sort_key(self.query.sort, self.task_manager.position)
+            if limit is not None:
+                return iter(heapq.nsmallest(limit, candidates, key=key))
+            return iter(sorted(candidates, key=key))
+        return islice(candidates, limit) if limit is not None else candidates
+
+
+def _priorities(predicate: Predicate) -> List[Priority]:
+    """Priorities matched by a priority predicate"""
+    if predicate.op == '!=':
+        return [p for p in Priority if p not in predicate.value]
+    if isinstance(predicate.value, list):
+        return predicate.value
+    compare = COMPARE[predicate.op]
+    return [p for p in Priority if compare(p.value, predicate.value.value)]
+
+
+def _bitmap_option(predicates: List[Predicate], task_manager: TaskManager):
+    """Evaluate tag, status and priority predicates together with bitwise operations"""
+    any_of, none_of = [], []
+    statuses, priorities = set(TaskStatus), set(Priority)
+    for predicate in predicates:
+        if predicate.field == 'tag':
+            if predicate.op == '!=':
+                none_of.extend(predicate.value)
+            else:
+                any_of.append(predicate.value)
+        elif predicate.field == 'status':
+            matched = set(predicate.value)
+            statuses &= matched if predicate.op == '==' else set(TaskStatus) - matched
+        else:
+            priorities &= set(_priorities(predicate))
+
+    bitmap = task_manager.tags.match(
+        any_of=any_of, none_of=none_of,
+        statuses=statuses if statuses != set(TaskStatus) else None,
+        priorities=priorities if priorities != set(Priority) else None
+    )
+    source = "tag bitmaps (" + ", ".join(f"{p.field} {p.op} {_format_value(p.value)}" for p in predicates) + ")"
+    return bitmap.bit_count(), source, lambda: task_manager.tasks_in_bitmap(bitmap), predicates
+
+
+def plan_query(query: Query, task_manager: TaskManager) -> QueryPlan:
+    """Choose the most selective index for the query and leave the rest to a compiled filter"""
+    options = []  # (estimated rows, source name, candidates, predicates used)
+
+    # Tag filters, or several status/priority filters, are cheapest as one bitmap expression
+    bitmap_predicates = [p for p in query.predicates if p.field in BITMAP_FIELDS]
+    if any(p.field == 'tag' for p in bitmap_predicates) or len(bitmap_predicates) > 1:
+        options.append(_bitmap_option(bitmap_predicates, task_manager))
+
+    for predicate in query.predicates:
+        if predicate.field == 'id' and predicate.op == '==':
+            task = task_manager.get_task(predicate.value)
+            options.append((1 if task else 0, f"id = {predicate.value}",
+                            lambda task=task: [task] if task else [], [predicate]))
+        elif predicate.field == 'status' and predicate.op == '==':
+            buckets = [task_manager.status_index(status) for status in predicate.value]
+            options.append((sum(len(b) for b in buckets),
+                            "status index (" + ",".join(s.value for s in predicate.value) + ")",
+                            lambda buckets=buckets: [t for b in buckets for t in b.values()], [predicate]))
+        elif predicate.field == 'priority' and predicate.op != '!=':
+            priorities = _priorities(predicate)
+            buckets = [task_manager.priority_index(priority) for priority in priorities]
+            options.append((sum(len(b) for b in buckets),
+                            "priority index (" + ",".join(p.name.lower() for p in priorities) + ")",
+                            lambda buckets=buckets: [t for b in buckets for t in b.values()], [predicate]))
+
+    if options:
+        estimated_rows, source, candidates, used = min(options, key=lambda option: option[0])
+        if estimated_rows < len(task_manager.tasks):
+            residual = [p for p in query.predicates if all(p is not u for u in used)]
+            return QueryPlan(query, task_manager, source, candidates, False, residual, estimated_rows)
+
+    return QueryPlan(query, task_manager, "full scan", lambda: task_manager.tasks, True,
+                     list(query.predicates), len(task_manager.tasks))
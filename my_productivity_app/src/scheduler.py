@@ -0,0 +1,402 @@
+import heapq
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import config
+from .task_manager import Task, Priority
+from .task_lists import TaskListCatalog, DEFAULT_LIST
+
+
+WEEKDAYS = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+
+
+class TimerHandle:
+    """Entry in a TimingWheel; cancelling is O(1) and takes effect when its slot is reached"""
+    __slots__ = ('due_tick', 'payload', 'cancelled')
+
+    def __init__(self, due_tick: int, payload: Any):
+        self.due_tick = due_tick
+        self.payload = payload
+        self.cancelled = False
+
+    def __lt__(self, other: 'TimerHandle') -> bool:
+        return self.due_tick < other.due_tick
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimingWheel:
+    """Hierarchical timing wheel.
+
+    Level ``l`` has ``slots`` buckets, each covering ``slots ** l`` ticks.
+    Scheduling and cancelling are O(1); an entry is cascaded down at most
+    once per level, so advancing costs O(1) amortized per tick and entry.
+    Empty stretches of time are skipped instead of walked tick by tick.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 64, levels: int = 4,
+                 start: Optional[float] = None):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self.current_tick = int((time.time() if start is None else start) // tick_seconds)
+        self.wheels: List[List[List[TimerHandle]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.level_counts = [0] * levels
+        self.overflow: List[TimerHandle] = []  # heap of entries beyond the top level's span
+        self.expired: List[TimerHandle] = []   # entries scheduled in the past
+
+    def __len__(self) -> int:
+        return sum(self.level_counts) + len(self.overflow) + len(self.expired)
+
+    def schedule(self, when: float, payload: Any) -> TimerHandle:
+        """Schedule ``payload`` to fire at epoch time ``when``"""
+        handle = TimerHandle(int(when // self.tick_seconds), payload)
+        self._place(handle)
+        return handle
+
+    def _place(self, handle: TimerHandle):
+        delta = handle.due_tick - self.current_tick
+        if delta <= 0:
+            self.expired.append(handle)
+            return
+        span = self.slots
+        for level in range(self.levels):
+            if delta < span:
+                slot = (handle.due_tick // (span // self.slots)) % self.slots
+                self.wheels[level][slot].append(handle)
+                self.level_counts[level] += 1
+                return
+            span *= self.slots
+        heapq.heappush(self.overflow, handle)
+
+    def _cascade(self, level: int):
+        """Redistribute the level's current bucket into lower levels"""
+        slot = (self.current_tick // self.slots ** level) % self.slots
+        bucket = self.wheels[level][slot]
+        self.wheels[level][slot] = []
+        self.level_counts[level] -= len(bucket)
+        for handle in bucket:
+            if not handle.cancelled:
+                self._place(handle)
+
+    def _skip_empty(self, target_tick: int):
+        """Jump ahead to just before the next tick that could fire or cascade anything"""
+        for level in range(self.levels):
+            if self.level_counts[level]:
+                break
+        else:
+            level = self.levels
+        if level == 0:
+            return
+        boundary = self.slots ** level
+        next_boundary = (self.current_tick // boundary + 1) * boundary
+        self.current_tick = max(self.current_tick, min(target_tick, next_boundary) - 1)
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """Move the wheel to ``now`` and return the payloads that came due"""
+        target_tick = int((time.time() if now is None else now) // self.tick_seconds)
+        fired = [handle.payload for handle in self.expired if not handle.cancelled]
+        self.expired = []
+
+        while self.current_tick < target_tick:
+            self._skip_empty(target_tick)
+            if self.current_tick >= target_tick:
+                break
+            self.current_tick += 1
+
+            top_span = self.slots ** self.levels
+            if self.current_tick % top_span == 0:
+                while self.overflow and self.overflow[0].due_tick - self.current_tick < top_span:
+                    self._place(heapq.heappop(self.overflow))
+            for level in range(self.levels - 1, 0, -1):
+                if self.current_tick % self.slots ** level == 0:
+                    self._cascade(level)
+
+            slot = self.current_tick % self.slots
+            bucket = self.wheels[0][slot]
+            self.wheels[0][slot] = []
+            self.level_counts[0] -= len(bucket)
+            fired.extend(handle.payload for handle in bucket if not handle.cancelled)
+
+            # Cascading may have produced entries that are already due
+            fired.extend(handle.payload for handle in self.expired if not handle.cancelled)
+            self.expired = []
+
+        return fired
+
+
+def _parse_cron_field(field: str, low: int, high: int, names: Optional[Dict[str, int]] = None) -> Set[int]:
+    """Expand one cron field (``*``, lists, ranges, steps, day names) into a set of values"""
+    def value(text: str) -> int:
+        return names[text] if names and text in names else int(text)
+
+    values: Set[int] = set()
+    for part in field.lower().split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = value(start_text), value(end_text)
+        else:
+            start = value(part)
+            end = high if step > 1 else start
+        if not (low <= start <= high and low <= end <= high) or step < 1:
+            raise ValueError(f"Value out of range in '{field}'")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class RecurrenceRule:
+    """Repeat rule for recurring tasks.
+
+    Accepts ``daily [HH:MM]``, ``weekly DAY[,DAY...] [HH:MM]`` or a five-field
+    cron expression (``minute hour day-of-month month day-of-week``).
+    """
+
+    def __init__(self, text: str):
+        self.text = text.strip()
+        self.minutes, self.hours, self.days, self.months, self.weekdays = self._parse(self.text)
+        # Like cron, a restricted day-of-month and day-of-week match if either does
+        self.days_restricted = len(self.days) < 31
+        self.weekdays_restricted = len(self.weekdays) < 7
+
+    def _parse(self, text: str):
+        parts = text.lower().split()
+        if not parts:
+            raise ValueError("Empty recurrence rule")
+
+        if parts[0] in ('daily', 'weekly'):
+            args = parts[1:]
+            weekdays = '*'
+            if parts[0] == 'weekly':
+                if not args or ':' in args[0]:
+                    raise ValueError("Weekly rules need days, e.g. 'weekly mon,thu 09:00'")
+                weekdays = args.pop(0)
+            if len(args) > 1:
+                raise ValueError(f"Unexpected '{' '.join(args[1:])}' in rule '{text}'")
+            at = args[0] if args else '09:00'
+            match = re.fullmatch(r'(\d{1,2}):(\d{2})', at)
+            if not match:
+                raise ValueError(f"Invalid time '{at}', use HH:MM (e.g. 18:00)")
+            hour, minute = (int(value) for value in match.groups())
+            parts = [str(minute), str(hour), '*', '*', weekdays]
+
+        if len(parts) != 5:
+            raise ValueError(f"Invalid recurrence rule: '{text}'")
+        return (
+            _parse_cron_field(parts[0], 0, 59),
+            _parse_cron_field(parts[1], 0, 23),
+            _parse_cron_field(parts[2], 1, 31),
+            _parse_cron_field(parts[3], 1, 12),
+            {day % 7 for day in _parse_cron_field(parts[4], 0, 7, WEEKDAYS)},
+        )
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = (day.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First occurrence strictly after ``after``"""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        times = sorted((hour, minute) for hour in self.hours for minute in self.minutes)
+        # Five years covers every leap-day rule
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for hour, minute in times:
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate >= start:
+                        return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Recurrence rule never fires: '{self.text}'")
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass
+class RecurringTask:
+    id: int
+    title: str
+    rule: str
+    next_run: str
+    description: str = ""
+    priority: int = Priority.MEDIUM.value
+    task_list: str = DEFAULT_LIST
+
+
+@dataclass
+class ScheduledSession:
+    id: int
+    start_at: str
+    task_id: Optional[int] = None
+    task_list: str = DEFAULT_LIST
+
+
+class TaskScheduler:
+    """Recurring tasks and scheduled focus sessions, driven by a TimingWheel.
+
+    Each recurring task keeps only its next occurrence in the wheel; the task
+    instance is created when that occurrence comes due. Nothing runs in the
+    background: ``tick`` is called from the app loop.
+    """
+
+    def __init__(self, task_lists: TaskListCatalog, schedules_file: str = config.SCHEDULES_FILE,
+                 now: Optional[datetime] = None):
+        self.task_lists = task_lists
+        self.schedules_file = schedules_file
+        self.rules: Dict[int, RecurringTask] = {}
+        self.sessions: Dict[int, ScheduledSession] = {}
+        self.next_id = 1
+        self._handles: Dict[tuple, TimerHandle] = {}
+        start = (now or datetime.now()).timestamp()
+        self.wheel = TimingWheel(config.SCHEDULER_TICK_SECONDS, start=start)
+        self.load_data()
+
+    def add_recurring_task(self, title: str, rule: str, description: str = "",
+                           priority: Priority = Priority.MEDIUM, task_list: str = DEFAULT_LIST,
+                           now: Optional[datetime] = None) -> RecurringTask:
+        """Add a recurring task; raises ValueError for an invalid rule"""
+        next_run = RecurrenceRule(rule).next_after(now or datetime.now())
+        recurring = RecurringTask(
+            id=self.next_id,
+            title=title,
+            rule=rule,
+            next_run=next_run.isoformat(),
+            description=description,
+            priority=priority.value,
+            task_list=task_list
+        )
+        self.next_id += 1
+        self.rules[recurring.id] = recurring
+        self._schedule(('rule', recurring.id), next_run)
+        self.save_data()
+        return recurring
+
+    def schedule_session(self, start_at: datetime, task_id: Optional[int] = None,
+                         task_list: str = DEFAULT_LIST) -> ScheduledSession:
+        """Schedule a focus session to start at ``start_at``"""
+        session = ScheduledSession(id=self.next_id, start_at=start_at.isoformat(), task_id=task_id,
+                                   task_list=task_list)
+        self.next_id += 1
+        self.sessions[session.id] = session
+        self._schedule(('session', session.id), start_at)
+        self.save_data()
+        return session
+
+    def remove(self, schedule_id: int) -> bool:
+        """Remove a recurring task or scheduled session by ID"""
+        for kind, items in (('rule', self.rules), ('session', self.sessions)):
+            if schedule_id in items:
+                del items[schedule_id]
+                self._handles.pop((kind, schedule_id)).cancel()
+                self.save_data()
+                return True
+        return False
+
+    def remove_list(self, task_list: str):
+        """Drop every schedule belonging to a deleted task list"""
+        for kind, items in (('rule', self.rules), ('session', self.sessions)):
+            for schedule_id in [i for i, item in items.items() if item.task_list == task_list]:
+                del items[schedule_id]
+                self._handles.pop((kind, schedule_id)).cancel()
+        self.save_data()
+
+    def _schedule(self, key: tuple, when: datetime):
+        self._handles[key] = self.wheel.schedule(when.timestamp(), key)
+
+    def tick(self, now: Optional[datetime] = None) -> Tuple[List[Task], List[ScheduledSession]]:
+        """Materialize due recurring tasks; returns the new tasks and the sessions due to start"""
+        now = now or datetime.now()
+        new_tasks = []
+        due_sessions = []
+        changed = False
+
+        for kind, schedule_id in self.wheel.advance(now.timestamp()):
+            self._handles.pop((kind, schedule_id), None)
+            changed = True
+            items = self.rules if kind == 'rule' else self.sessions
+            task_list = items[schedule_id].task_list
+            if task_list not in self.task_lists.lists:
+                # The list disappeared from the catalog, e.g. after lists.json was reset
+                print(f"\n⚠️ Dropping schedule #{schedule_id}: task list '{task_list}' no longer exists")
+                del items[schedule_id]
+                continue
+            if kind == 'rule':
+                recurring = self.rules[schedule_id]
+                task_manager = self.task_lists.get(recurring.task_list)
+                new_tasks.append(task_manager.add_task(recurring.title, recurring.description,
+                                           Priority(recurring.priority), due_at=recurring.next_run,
+                                           recurrence_id=recurring.id))
+                # Missed occurrences collapse into this one rather than piling up
+                next_run = RecurrenceRule(recurring.rule).next_after(
+                    max(now, datetime.fromisoformat(recurring.next_run)))
+                recurring.next_run = next_run.isoformat()
+                self._schedule(('rule', recurring.id), next_run)
+            else:
+                due_sessions.append(self.sessions.pop(schedule_id))
+
+        if changed:
+            self.save_data()
+        return new_tasks, due_sessions
+
+    def save_data(self):
+        """Save schedules to JSON file"""
+        data = {
+            'recurring': [asdict(recurring) for recurring in self.rules.values()],
+            'sessions': [asdict(session) for session in self.sessions.values()],
+            'next_id': self.next_id
+        }
+        try:
+            tmp_file = self.schedules_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.schedules_file)
+        except Exception as e:
+            print(f"Error saving schedules: {e}")
+
+    def load_data(self):
+        """Load schedules from JSON file and put them on the wheel"""
+        try:
+            if os.path.exists(self.schedules_file):
+                with open(self.schedules_file, 'r') as f:
+                    data = json.load(f)
+
+                self.next_id = data.get('next_id', 1)
+                for recurring_data in data.get('recurring', []):
+                    recurring = RecurringTask(**recurring_data)
+                    if recurring.task_list not in self.task_lists.lists:
+                        print(f"Skipping recurring task #{recurring.id}: unknown task list '{recurring.task_list}'")
+                        continue
+                    try:
+                        RecurrenceRule(recurring.rule)
+                    except ValueError as e:
+                        # Rules saved before stricter parsing may no longer be valid
+                        print(f"Skipping recurring task #{recurring.id}: {e}")
+                        continue
+                    self.rules[recurring.id] = recurring
+                    self._schedule(('rule', recurring.id), datetime.fromisoformat(recurring.next_run))
+                for session_data in data.get('sessions', []):
+                    session = ScheduledSession(**session_data)
+                    if session.task_list not in self.task_lists.lists:
+                        print(f"Skipping scheduled session #{session.id}: unknown task list '{session.task_list}'")
+                        continue
+                    self.sessions[session.id] = session
+                    self._schedule(('session', session.id), datetime.fromisoformat(session.start_at))
+        except Exception as e:
+            print(f"Error loading schedules: {e}")
@@ -0,0 +1,214 @@
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .task_manager import Task, Priority, TaskStatus, task_to_dict, task_from_dict
+
+
+# File layout: header | fixed-width records | string heap (UTF-8)
+MAGIC = b'PTSK'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQQ')          # magic, version, count, next_id, heap offset
+# id, created/completed (microseconds since epoch), title/description/extra heap offsets,
+# title/description/extra lengths, priority, status, padding to 64 bytes
+RECORD = struct.Struct('<QqqQQQIIIBB2x')
+
+# Byte offsets of single-byte columns inside a record, used for strided scans
+PRIORITY_OFFSET = 60
+STATUS_OFFSET = 61
+
+STATUS_CODES = {TaskStatus.TODO: 0, TaskStatus.IN_PROGRESS: 1, TaskStatus.COMPLETED: 2}
+STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+
+# Fields stored in fixed-width columns; anything else goes into the per-record JSON extra
+CORE_FIELDS = ('id', 'title', 'description', 'priority', 'status', 'created_at', 'completed_at')
+
+NO_TIMESTAMP = -(2 ** 63)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: Optional[str]) -> int:
+    if not value:
+        return NO_TIMESTAMP
+    return (datetime.fromisoformat(value) - EPOCH) // MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[str]:
+    if value == NO_TIMESTAMP:
+        return None
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def write_snapshot(path: str, tasks: List[Task], next_id: int):
+    """Write tasks to a binary snapshot file, replacing it atomically"""
+    heap = bytearray()
+    records = bytearray(RECORD.size * len(tasks))
+
+    def heap_append(data: bytes) -> Tuple[int, int]:
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    for i, task in enumerate(tasks):
+        title_off, title_len = heap_append(task.title.encode('utf-8'))
+        desc_off, desc_len = heap_append(task.description.encode('utf-8'))
+        extra = {key: value for key, value in task_to_dict(task).items()
+                 if key not in CORE_FIELDS and value not in (None, [])}
+        extra_off, extra_len = heap_append(json.dumps(extra).encode('utf-8') if extra else b'')
+        RECORD.pack_into(
+            records, i * RECORD.size,
+            task.id, _to_micros(task.created_at), _to_micros(task.completed_at),
+            title_off, desc_off, extra_off, title_len, desc_len, extra_len,
+            task.priority.value, STATUS_CODES[task.status]
+        )
+
+    heap_offset = HEADER.size + len(records)
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(tasks), next_id, heap_offset))
+        f.write(records)
+        f.write(heap)
+    os.replace(tmp_file, path)
+
+
+class TaskSnapshot:
+    """Read-only, memory-mapped view of a snapshot file.
+
+    Counting and filtering work on the mapped records directly; ``Task``
+    objects are only built for the records that are actually returned.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError(f"Not a task snapshot: {path}")
+
+        magic, version, self.count, self.next_id, self._heap_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a task snapshot: {path}")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the file"""
+        self._mm.close()
+        self._file.close()
+
+    def _column(self, offset: int) -> bytes:
+        """Every record's byte at ``offset``, gathered with one strided slice"""
+        start = HEADER.size + offset
+        return self._mm[start:start + RECORD.size * self.count:RECORD.size]
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._heap_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Task counts per status"""
+        column = self._column(STATUS_OFFSET)
+        return {status: column.count(code) for status, code in STATUS_CODES.items()}
+
+    def count_by_priority(self) -> Dict[Priority, int]:
+        """Task counts per priority"""
+        column = self._column(PRIORITY_OFFSET)
+        return {priority: column.count(priority.value) for priority in Priority}
+
+    def matching_indexes(self, status: Optional[TaskStatus] = None,
+                         priority: Optional[Priority] = None) -> Iterator[int]:
+        """Record indexes matching the given status and/or priority"""
+        if status is None and priority is None:
+            yield from range(self.count)
+            return
+
+        # Scan the more restrictive single-byte column with bytes.find, check the other per hit
+        if status is not None:
+            column, needle = self._column(STATUS_OFFSET), STATUS_CODES[status]
+            other = self._column(PRIORITY_OFFSET) if priority is not None else None
+            other_needle = priority.value if priority is not None else None
+        else:
+            column, needle = self._column(PRIORITY_OFFSET), priority.value
+            other, other_needle = None, None
+
+        target = bytes([needle])
+        i = column.find(target)
+        while i != -1:
+            if other is None or other[i] == other_needle:
+                yield i
+            i = column.find(target, i + 1)
+
+    def row(self, index: int) -> Tuple[int, str, Priority, TaskStatus, Optional[str]]:
+        """Lightweight (id, title, priority, status, created_at) tuple for listings"""
+        (task_id, created, _completed, title_off, _desc_off, _extra_off,
+         title_len, _desc_len, _extra_len, priority, status) = RECORD.unpack_from(
+            self._mm, HEADER.size + index * RECORD.size)
+        return (task_id, self._string(title_off, title_len), Priority(priority),
+                STATUS_BY_CODE[status], _from_micros(created))
+
+    def task(self, index: int) -> Task:
+        """Materialize the full task stored at ``index``"""
+        (task_id, created, completed, title_off, desc_off, extra_off,
+         title_len, desc_len, extra_len, priority, status) = RECORD.unpack_from(
+            self._mm, HEADER.size + index * RECORD.size)
+        task_data = json.loads(self._string(extra_off, extra_len)) if extra_len else {}
+        task_data.update(
+            id=task_id,
+            title=self._string(title_off, title_len),
+            description=self._string(desc_off, desc_len),
+            priority=priority,
+            status=STATUS_BY_CODE[status].value,
+            created_at=_from_micros(created) or '',
+            completed_at=_from_micros(completed)
+        )
+        return task_from_dict(task_data)
+
+    def iter_tasks(self, status: Optional[TaskStatus] = None,
+                   priority: Optional[Priority] = None) -> Iterator[Task]:
+        """Materialize only the tasks matching the given filters"""
+        for index in self.matching_indexes(status, priority):
+            yield self.task(index)
+
+    def load_all(self) -> List[Task]:
+        """Materialize every task; a bulk version of ``task`` used by TaskManager.load_data"""
+        view = memoryview(self._mm)
+        records = view[HEADER.size:HEADER.size + RECORD.size * self.count]
+        heap = view[self._heap_offset:]
+        priorities = {priority.value: priority for priority in Priority}
+        tasks = []
+        try:
+            for (task_id, created, completed, title_off, desc_off, extra_off,
+                 title_len, desc_len, extra_len, priority, status) in RECORD.iter_unpack(records):
+                task = Task(
+                    id=task_id,
+                    title=str(heap[title_off:title_off + title_len], 'utf-8'),
+                    description=str(heap[desc_off:desc_off + desc_len], 'utf-8'),
+                    priority=priorities[priority],
+                    status=STATUS_BY_CODE[status],
+                    created_at=_from_micros(created) or '',
+                    completed_at=_from_micros(completed)
+                )
+                if extra_len:
+                    extra = json.loads(str(heap[extra_off:extra_off + extra_len], 'utf-8'))
+                    task = task_from_dict(dict(task_to_dict(task), **extra))
+                tasks.append(task)
+        finally:
+            # Exported views must be released before the mmap can be closed
+            del records, heap
+            view.release()
+        return tasks
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+TAG_PATTERN = re.compile(r'[^\s,#]+')
+
+
+def normalize_tags(tags) -> List[str]:
+    """Lower-cased, de-duplicated tags from a list or a "work, #urgent home" string"""
+    if isinstance(tags, str):
+        tags = TAG_PATTERN.findall(tags)
+    normalized = []
+    for tag in tags:
+        tag = tag.strip().lstrip('#').lower()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def tag_index_path(data_file: str) -> str:
+    """Tag index file stored next to a task data file"""
+    return data_file + '.tags'
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    """(size, mtime) of a file, used to tell whether a saved index still matches it"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _bitmap_from_ids(ids: List[int]) -> int:
+    """Build a bitmap in one pass instead of OR-ing a growing int per ID"""
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for task_id in ids:
+        bits[task_id >> 3] |= 1 << (task_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def iter_ids(bitmap: int) -> Iterator[int]:
+    """Task IDs set in a bitmap, in ascending order"""
+    # One conversion to a bit string is much cheaper than repeatedly masking a large int
+    bits = bin(bitmap)[:1:-1]
+    i = bits.find('1')
+    while i != -1:
+        yield i
+        i = bits.find('1', i + 1)
+
+
+class TagIndex:
+    """Bitmap index of task tags, plus status and priority bitmaps to combine them with.
+
+    Every bitmap is a Python int with bit N set when task N belongs to the
+    set, so AND/OR/NOT filters over any number of tags are a few integer
+    operations rather than a scan over the tasks. Status and priority keys
+    are the enum values, so this module doesn't depend on the task model.
+    """
+
+    def __init__(self):
+        self.tags: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.status: Dict[str, int] = {}
+        self.priority: Dict[int, int] = {}
+        self.all = 0
+
+    def rebuild(self, tasks: Iterable):
+        """Build every bitmap from scratch"""
+        tag_ids: Dict[str, List[int]] = {}
+        status_ids: Dict[str, List[int]] = {}
+        priority_ids: Dict[int, List[int]] = {}
+        all_ids = []
+        for task in tasks:
+            all_ids.append(task.id)
+            status_ids.setdefault(task.status.value, []).append(task.id)
+            priority_ids.setdefault(task.priority.value, []).append(task.id)
+            for tag in task.tags:
+                tag_ids.setdefault(tag, []).append(task.id)
+
+        self.tags = {tag: _bitmap_from_ids(ids) for tag, ids in tag_ids.items()}
+        self.counts = {tag: len(ids) for tag, ids in tag_ids.items()}
+        self.status = {status: _bitmap_from_ids(ids) for status, ids in status_ids.items()}
+        self.priority = {priority: _bitmap_from_ids(ids) for priority, ids in priority_ids.items()}
+        self.all = _bitmap_from_ids(all_ids)
+
+    def add(self, task):
+        """Index a single task"""
+        bit = 1 << task.id
+        self.all |= bit
+        self.status[task.status.value] = self.status.get(task.status.value, 0) | bit
+        self.priority[task.priority.value] = self.priority.get(task.priority.value, 0) | bit
+        for tag in task.tags:
+            bitmap = self.tags.get(tag, 0)
+            if not bitmap & bit:
+                self.tags[tag] = bitmap | bit
+                self.counts[tag] = self.counts.get(tag, 0) + 1
+
+    def remove(self, task):
+        """Drop a single task; must be called before its fields change"""
+        bit = 1 << task.id
+        self.all &= ~bit
+        self.status[task.status.value] = self.status.get(task.status.value, 0) & ~bit
+        self.priority[task.priority.value] = self.priority.get(task.priority.value, 0) & ~bit
+        for tag in task.tags:
+            bitmap = self.tags.get(tag, 0)
+            if bitmap & bit:
+                self.counts[tag] -= 1
+                if self.counts[tag]:
+                    self.tags[tag] = bitmap & ~bit
+                else:
+                    del self.tags[tag], self.counts[tag]
+
+    def match(self, all_of: Iterable[str] = (), any_of: Iterable[Iterable[str]] = (),
+              none_of: Iterable[str] = (), statuses: Optional[Iterable] = None,
+              priorities: Optional[Iterable] = None) -> int:
+        """Bitmap of tasks having every tag in ``all_of``, at least one tag from each group
+        in ``any_of``, none of ``none_of``, and (if given) one of the statuses and priorities"""
+        bitmap = self.all
+        for tag in all_of:
+            bitmap &= self.tags.get(tag, 0)
+        for group in any_of:
+            bitmap &= reduce(or_, (self.tags.get(tag, 0) for tag in group), 0)
+        for tag in none_of:
+            bitmap &= ~self.tags.get(tag, 0)
+        if statuses is not None:
+            bitmap &= reduce(or_, (self.status.get(status.value, 0) for status in statuses), 0)
+        if priorities is not None:
+            bitmap &= reduce(or_, (self.priority.get(priority.value, 0) for priority in priorities), 0)
+        return bitmap
+
+    def tag_counts(self, within: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(tag, task count) pairs, most used first; ``within`` restricts to a bitmap"""
+        if within is None:
+            counts = self.counts.items()
+        else:
+            counts = ((tag, (bitmap & within).bit_count()) for tag, bitmap in self.tags.items())
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def save_data(self, path: str, data_file: str):
+        """Save the bitmaps, stamped with the data file they were built from"""
+        data = {
+            'data_file': _file_signature(data_file),
+            'tags': {tag: format(bitmap, 'x') for tag, bitmap in self.tags.items()},
+            'counts': self.counts,
+            'status': {status: format(bitmap, 'x') for status, bitmap in self.status.items()},
+            'priority': {str(priority): format(bitmap, 'x') for priority, bitmap in self.priority.items()},
+            'all': format(self.all, 'x')
+        }
+        try:
+            tmp_file = path + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, path)
+        except Exception as e:
+            print(f"Error saving tag index: {e}")
+
+    def load_data(self, path: str, data_file: str) -> bool:
+        """Load saved bitmaps; returns False (leaving the index empty) if they're
+        missing or were saved for a different version of the data file"""
+        try:
+            if not os.path.exists(path):
+                return False
+            with open(path, 'r') as f:
+                data = json.load(f)
+            signature = _file_signature(data_file)
+            if signature is None or data.get('data_file') != signature:
+                return False
+
+            self.tags = {tag: int(bitmap, 16) for tag, bitmap in data['tags'].items()}
+            self.counts = data['counts']
+            self.status = {status: int(bitmap, 16) for status, bitmap in data['status'].items()}
+            self.priority = {int(priority): int(bitmap, 16) for priority, bitmap in data['priority'].items()}
+            self.all = int(data['all'], 16)
+            return True
+        except Exception as e:
+            print(f"Error loading tag index: {e}")
+            self.__init__()
+            return False
@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+import config
+from .task_manager import Task, TaskManager, Priority, TaskStatus
+from .tags import tag_index_path
+
+DEFAULT_LIST = 'default'
+
+T = TypeVar('T')
+
+
+class TaskListCatalog:
+    """Named task lists, each stored in its own shard file.
+
+    Only shards that are actually used get loaded. The catalog file keeps
+    per-list task counts, refreshed whenever a shard is saved, so overview
+    screens can show every list without opening any shard.
+    """
+
+    def __init__(self, catalog_file: str = config.CATALOG_FILE, lists_dir: str = config.LISTS_DIR,
+                 default_data_file: str = config.TASKS_FILE, default_archive_dir: str = config.ARCHIVE_DIR):
+        self.catalog_file = catalog_file
+        self.lists_dir = lists_dir
+        # The default list keeps using the original task file and archive
+        self.default_paths = (default_data_file, default_archive_dir)
+        self.lists: Dict[str, Dict] = {}
+        self.active_name = DEFAULT_LIST
+        self._managers: Dict[str, TaskManager] = {}
+        self._lock = threading.RLock()
+        self.load_data()
+
+        if DEFAULT_LIST not in self.lists:
+            self.lists[DEFAULT_LIST] = {'counts': {}}
+            self.get(DEFAULT_LIST)
+        if self.active_name not in self.lists:
+            self.active_name = DEFAULT_LIST
+
+    @property
+    def active(self) -> TaskManager:
+        """Task manager of the active list"""
+        return self.get(self.active_name)
+
+    def names(self) -> List[str]:
+        """List names, default first"""
+        return [DEFAULT_LIST] + sorted(name for name in self.lists if name != DEFAULT_LIST)
+
+    def shard_paths(self, name: str) -> Tuple[str, str]:
+        """(data file, archive dir) of a list"""
+        if name == DEFAULT_LIST:
+            return self.default_paths
+        slug = self.lists[name]['slug']
+        extension = '.snap' if config.STORAGE_FORMAT == 'snapshot' else '.json'
+        return os.path.join(self.lists_dir, slug + extension), os.path.join(self.lists_dir, slug + '.archive')
+
+    def get(self, name: str) -> TaskManager:
+        """Task manager for a list, loading its shard on first use"""
+        with self._lock:
+            if name in self._managers:
+                return self._managers[name]
+            data_file, archive_dir = self.shard_paths(name)
+        # Shards load outside the lock so fan-out can load several at once
+        manager = TaskManager(data_file, archive_dir, list_name=name, on_save=self.update_counts)
+        with self._lock:
+            if name not in self._managers:
+                self._managers[name] = manager
+                self.update_counts(manager)
+            return self._managers[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._managers
+
+    def create_list(self, name: str) -> bool:
+        """Create an empty list; returns False if the name is taken"""
+        name = name.strip()
+        if not re.match(r'^[\w][\w -]*$', name):
+            raise ValueError("List names may contain letters, digits, spaces, '-' and '_'")
+        if name in self.lists:
+            return False
+
+        slug = re.sub(r'[^\w-]+', '-', name.lower())
+        with self._lock:
+            if any(entry.get('slug') == slug for entry in self.lists.values()):
+                return False
+            self.lists[name] = {'slug': slug, 'counts': {}}
+            self.save_data()
+        return True
+
+    def delete_list(self, name: str) -> bool:
+        """Delete a list and its shard; the default list can't be deleted"""
+        if name == DEFAULT_LIST or name not in self.lists:
+            return False
+        with self._lock:
+            data_file, archive_dir = self.shard_paths(name)
+            del self.lists[name]
+            self._managers.pop(name, None)
+            if self.active_name == name:
+                self.active_name = DEFAULT_LIST
+            self.save_data()
+        for path in (data_file, tag_index_path(data_file)):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(archive_dir, ignore_errors=True)
+        return True
+
+    def switch(self, name: str) -> TaskManager:
+        """Make a list active, loading it if needed"""
+        if name not in self.lists:
+            raise KeyError(name)
+        self.active_name = name
+        self.save_data()
+        return self.active
+
+    def update_counts(self, manager: TaskManager):
+        """Refresh a list's counts in the catalog after its shard changed"""
+        counts = {status.value: len(manager.status_index(status)) for status in TaskStatus}
+        counts['archived'] = manager.archive.total_count()
+        # Open tasks per priority, counted on the tag index's status/priority bitmaps
+        open_tasks = manager.tags.match(statuses=[TaskStatus.TODO, TaskStatus.IN_PROGRESS])
+        open_by_priority = {str(priority.value): (open_tasks & manager.tags.match(priorities=[priority])).bit_count()
+                            for priority in Priority}
+        with self._lock:
+            entry = self.lists.get(manager.list_name)
+            if entry is not None and (entry.get('counts'), entry.get('open_by_priority')) != (counts, open_by_priority):
+                entry['counts'] = counts
+                entry['open_by_priority'] = open_by_priority
+                self.save_data()
+
+    def counts(self, name: str) -> Dict[str, int]:
+        """Catalog counts for a list, without opening its shard"""
+        return self.lists[name].get('counts', {})
+
+    def fan_out(self, func: Callable[[TaskManager], T], names: Optional[List[str]] = None) -> Dict[str, T]:
+        """Run ``func`` against several lists in parallel, loading shards as needed"""
+        names = names or self.names()
+        with ThreadPoolExecutor(max_workers=config.LIST_FANOUT_WORKERS) as executor:
+            results = executor.map(lambda name: func(self.get(name)), names)
+            return dict(zip(names, results))
+
+    def query_all(self, text: str) -> List[Tuple[str, Task]]:
+        """Run a query over every list; sort and limit apply to the combined results"""
+        from .query import parse_query, plan_query, sort_key
+        query = parse_query(text)
+        per_list = self.fan_out(lambda manager: list(plan_query(query, manager).execute()))
+
+        results = [(name, task) for name, tasks in per_list.items() for task in tasks]
+        if query.sort:
+            key = sort_key(query.sort)
+            results.sort(key=lambda item: key(item[1]))
+        return results[:query.limit] if query.limit is not None else results
+
+    def priority_counts_all(self) -> Dict[Priority, int]:
+        """Open task counts per priority across every list, read from the catalog"""
+        # Catalogs saved before these counts were kept get them filled in by loading those shards once
+        missing = [name for name in self.names() if 'open_by_priority' not in self.lists[name]]
+        if missing:
+            self.fan_out(lambda manager: None, missing)
+
+        totals = {priority: 0 for priority in Priority}
+        for name in self.names():
+            counts = self.lists[name].get('open_by_priority', {})
+            for priority in Priority:
+                totals[priority] += counts.get(str(priority.value), 0)
+        return totals
+
+    def save_data(self):
+        """Save the catalog"""
+        data = {'active': self.active_name, 'lists': self.lists}
+        try:
+            with self._lock:
+                tmp_file = self.catalog_file + '.tmp'
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_file, self.catalog_file)
+        except Exception as e:
+            print(f"Error saving task lists: {e}")
+
+    def load_data(self):
+        """Load the catalog"""
+        os.makedirs(self.lists_dir, exist_ok=True)
+        try:
+            if os.path.exists(self.catalog_file):
+                with open(self.catalog_file, 'r') as f:
+                    data = json.load(f)
+                self.lists = data.get('lists', {})
+                self.active_name = data.get('active', DEFAULT_LIST)
+        except Exception as e:
+            print(f"Error loading task lists: {e}")
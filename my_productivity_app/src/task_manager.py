@@ -1,13 +1,18 @@
+import functools
 import json
 import os
-from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+import threading
+from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict, field
+from typing import Callable, List, Dict, Optional, Iterator, Tuple
 from enum import Enum
 
 
 # Import TASKS_FILE from config.py
 import config # You can import config directly
+from .archive import TaskArchive
+from .dependencies import DependencyGraph
+from .tags import TagIndex, iter_ids, normalize_tags, tag_index_path
 
 
 class Priority(Enum):
@@ -29,46 +34,177 @@ class Task:
     status: TaskStatus = TaskStatus.TODO
     created_at: str = ""
     completed_at: Optional[str] = None
+    due_at: Optional[str] = None
+    recurrence_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    depends_on: List[int] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
     
     def __post_init__(self):
         if not self.created_at:
             self.created_at = datetime.now().isoformat()
 
 
+def task_to_dict(task: Task) -> Dict:
+    """Serialize a task to a JSON-compatible dict"""
+    task_dict = asdict(task)
+    task_dict['priority'] = task.priority.value
+    task_dict['status'] = task.status.value
+    return task_dict
+
+
+def task_from_dict(task_data: Dict) -> Task:
+    """Build a task from a dict produced by task_to_dict"""
+    return Task(
+        id=task_data['id'],
+        title=task_data['title'],
+        description=task_data.get('description', ''),
+        priority=Priority(task_data.get('priority', 2)),
+        status=TaskStatus(task_data.get('status', 'todo')),
+        created_at=task_data.get('created_at', ''),
+        completed_at=task_data.get('completed_at'),
+        due_at=task_data.get('due_at'),
+        recurrence_id=task_data.get('recurrence_id'),
+        parent_id=task_data.get('parent_id'),
+        depends_on=list(task_data.get('depends_on', [])),
+        tags=list(task_data.get('tags', []))
+    )
+
+
+def _synchronized(method):
+    """Run a TaskManager method while holding its lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TaskManager:
-    def __init__(self, data_file: str = config.TASKS_FILE):
+    def __init__(self, data_file: str = config.TASKS_FILE, archive_dir: str = config.ARCHIVE_DIR,
+                 list_name: str = 'default', on_save: Optional[Callable[['TaskManager'], None]] = None):
         self.tasks: List[Task] = []
         self.next_id = 1
         self.data_file = data_file
+        self.tag_index_file = tag_index_path(data_file)
+        self.list_name = list_name
+        self.on_save = on_save
+        # Session hooks update tasks from worker threads, so mutations and saves are serialized
+        self._lock = threading.RLock()
+        self.archive = TaskArchive(archive_dir)
+        # Secondary indexes, kept in sync by every mutating method
+        self._by_id: Dict[int, Task] = {}
+        self._status_index: Dict[TaskStatus, Dict[int, Task]] = {}
+        self._priority_index: Dict[Priority, Dict[int, Task]] = {}
+        self._positions: Optional[Dict[int, int]] = None
+        self.dependencies = DependencyGraph()
+        self.tags = TagIndex()
         self.load_data()
+        # The tag bitmaps are saved alongside the data file and only rebuilt if they don't match it
+        self.rebuild_indexes(rebuild_tags=not self.tags.load_data(self.tag_index_file, self.data_file))
+        self.archive_completed()
+        
+    def rebuild_indexes(self, rebuild_tags: bool = True):
+        """Rebuild the ID, status, priority and tag indexes from self.tasks"""
+        self._by_id = {}
+        self._status_index = {status: {} for status in TaskStatus}
+        self._priority_index = {priority: {} for priority in Priority}
+        self._positions = None
+        for task in self.tasks:
+            self._by_id[task.id] = task
+            self._status_index[task.status][task.id] = task
+            self._priority_index[task.priority][task.id] = task
+        if rebuild_tags:
+            self.tags.rebuild(self.tasks)
+        self.dependencies.rebuild(
+            (task.id, task.status == TaskStatus.COMPLETED, task.status == TaskStatus.TODO, task.depends_on)
+            for task in self.tasks
+        )
+            
+    def _index_task(self, task: Task):
+        self._by_id[task.id] = task
+        self._status_index[task.status][task.id] = task
+        self._priority_index[task.priority][task.id] = task
+        self.tags.add(task)
+        
+    def _unindex_task(self, task: Task):
+        del self._by_id[task.id]
+        del self._status_index[task.status][task.id]
+        del self._priority_index[task.priority][task.id]
+        self.tags.remove(task)
+        
+    def _sync_dependency_state(self, task: Task):
+        self.dependencies.set_state(task.id, task.status == TaskStatus.COMPLETED,
+                                    task.status == TaskStatus.TODO)
+        
+    def position(self, task_id: int) -> int:
+        """Index of a task in the user's ordering; recomputed lazily after removals and reorders"""
+        if self._positions is None:
+            self._positions = {task.id: i for i, task in enumerate(self.tasks)}
+        return self._positions[task_id]
         
-    def add_task(self, title: str, description: str = "", priority: Priority = Priority.MEDIUM) -> Task:
+    def status_index(self, status: TaskStatus) -> Dict[int, Task]:
+        """Tasks with the given status, keyed by ID (do not modify)"""
+        return self._status_index[status]
+        
+    def priority_index(self, priority: Priority) -> Dict[int, Task]:
+        """Tasks with the given priority, keyed by ID (do not modify)"""
+        return self._priority_index[priority]
+        
+    @_synchronized
+    def add_task(self, title: str, description: str = "", priority: Priority = Priority.MEDIUM,
+                 due_at: Optional[str] = None, recurrence_id: Optional[int] = None,
+                 parent_id: Optional[int] = None, tags: Optional[List[str]] = None) -> Task:
         """Add a new task"""
         task = Task(
             id=self.next_id,
             title=title,
             description=description,
-            priority=priority
+            priority=priority,
+            due_at=due_at,
+            recurrence_id=recurrence_id,
+            parent_id=parent_id,
+            tags=normalize_tags(tags or [])
         )
         self.tasks.append(task)
+        self._index_task(task)
+        self.dependencies.add_node(task.id)
+        if self._positions is not None:
+            self._positions[task.id] = len(self.tasks) - 1
         self.next_id += 1
         self.save_data()
         return task
         
+    @_synchronized
     def remove_task(self, task_id: int) -> bool:
         """Remove a task by ID"""
         for i, task in enumerate(self.tasks):
             if task.id == task_id:
                 del self.tasks[i]
+                self._unindex_task(task)
+                self._positions = None
+                # Dependents stop waiting on the removed task and subtasks are detached
+                for dependent_id in self.dependencies.dependents[task_id]:
+                    self._by_id[dependent_id].depends_on.remove(task_id)
+                for dependency_id in self.dependencies.dependencies[task_id]:
+                    if self._by_id[dependency_id].parent_id == task_id:
+                        self._by_id[dependency_id].parent_id = None
+                self.dependencies.remove_node(task_id)
                 self.save_data()
                 return True
         return False
         
+    @_synchronized
     def update_task(self, task_id: int, **kwargs) -> bool:
         """Update task attributes"""
         task = self.get_task(task_id)
         if task:
+            was_completed = task.status == TaskStatus.COMPLETED
+            self._unindex_task(task)
             for key, value in kwargs.items():
+                if key == 'depends_on':
+                    # Dependency edges go through add_dependency so cycles are checked
+                    continue
                 if hasattr(task, key):
                     if key == 'priority' and isinstance(value, (int, str)):
                         try:
@@ -82,19 +218,26 @@ class TaskManager:
                         except ValueError:
                             print(f"Invalid status value: {value}")
                             continue
+                    elif key == 'tags':
+                        task.tags = normalize_tags(value)
                     else:
                         setattr(task, key, value)
+            if task.status != TaskStatus.COMPLETED:
+                task.completed_at = None
+            elif (not was_completed and 'completed_at' not in kwargs) or not task.completed_at:
+                # Re-completing a reopened task must not keep its old completion date
+                task.completed_at = datetime.now().isoformat()
+            self._index_task(task)
+            self._sync_dependency_state(task)
             self.save_data()
             return True
         return False
         
     def get_task(self, task_id: int) -> Optional[Task]:
         """Get task by ID"""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._by_id.get(task_id)
         
+    @_synchronized
     def reorder_tasks(self, task_id: int, new_position: int) -> bool:
         """Reorder tasks by moving task to new position"""
         task = None
@@ -109,77 +252,188 @@ class TaskManager:
         if task and 0 <= new_position < len(self.tasks):
             self.tasks.pop(old_index)
             self.tasks.insert(new_position, task)
+            self._positions = None
             self.save_data()
             return True
         return False
         
     def get_tasks_by_status(self, status: TaskStatus) -> List[Task]:
         """Filter tasks by status"""
-        return [task for task in self.tasks if task.status == status]
+        return sorted(self._status_index[status].values(), key=lambda task: self.position(task.id))
         
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
         """Filter tasks by priority"""
-        return [task for task in self.tasks if task.priority == priority]
+        return sorted(self._priority_index[priority].values(), key=lambda task: self.position(task.id))
+        
+    def tasks_in_bitmap(self, bitmap: int) -> List[Task]:
+        """Tasks whose IDs are set in a tag index bitmap, in ID order"""
+        return [self._by_id[task_id] for task_id in iter_ids(bitmap)]
+        
+    def get_tasks_by_tags(self, all_of: Optional[List[str]] = None, any_of: Optional[List[str]] = None,
+                          none_of: Optional[List[str]] = None) -> List[Task]:
+        """Tasks with every tag in ``all_of``, at least one in ``any_of`` and none in ``none_of``"""
+        bitmap = self.tags.match(normalize_tags(all_of or []), [normalize_tags(any_of)] if any_of else (),
+                                 normalize_tags(none_of or []))
+        return sorted(self.tasks_in_bitmap(bitmap), key=lambda task: self.position(task.id))
+        
+    def tag_counts(self, open_only: bool = False) -> List[Tuple[str, int]]:
+        """(tag, count) pairs, most used first; ``open_only`` skips completed tasks"""
+        if not open_only:
+            return self.tags.tag_counts()
+        return self.tags.tag_counts(self.tags.match(statuses=[TaskStatus.TODO, TaskStatus.IN_PROGRESS]))
+        
+    @_synchronized
+    def add_dependency(self, task_id: int, depends_on_id: int):
+        """Make a task wait for another; raises ValueError for unknown tasks or cycles"""
+        task, dependency = self.get_task(task_id), self.get_task(depends_on_id)
+        if not task or not dependency:
+            raise ValueError("Task not found")
+        self.dependencies.add_edge(depends_on_id, task_id)
+        if depends_on_id not in task.depends_on:
+            task.depends_on.append(depends_on_id)
+        self.save_data()
+        
+    @_synchronized
+    def remove_dependency(self, task_id: int, depends_on_id: int) -> bool:
+        """Remove a dependency between two tasks"""
+        task = self.get_task(task_id)
+        if not task or depends_on_id not in task.depends_on:
+            return False
+        task.depends_on.remove(depends_on_id)
+        self.dependencies.remove_edge(depends_on_id, task_id)
+        self.save_data()
+        return True
         
+    @_synchronized
+    def add_subtask(self, parent_id: int, title: str, description: str = "",
+                    priority: Optional[Priority] = None) -> Task:
+        """Add a subtask; the parent waits until all of its subtasks are done"""
+        parent = self.get_task(parent_id)
+        if not parent:
+            raise ValueError("Task not found")
+        subtask = self.add_task(title, description, priority or parent.priority, parent_id=parent_id)
+        self.add_dependency(parent_id, subtask.id)
+        return subtask
+        
+    def get_subtasks(self, parent_id: int) -> List[Task]:
+        """Subtasks of a task, in list order"""
+        children = [self._by_id[task_id] for task_id in self.dependencies.dependencies.get(parent_id, ())
+                    if self._by_id[task_id].parent_id == parent_id]
+        return sorted(children, key=lambda task: self.position(task.id))
+        
+    def get_blockers(self, task_id: int) -> List[int]:
+        """IDs of unfinished tasks this task is waiting for"""
+        return self.dependencies.blockers(task_id) if task_id in self._by_id else []
+        
+    def get_ready_tasks(self) -> List[Task]:
+        """TODO tasks whose dependencies are all complete, in list order"""
+        return sorted((self._by_id[task_id] for task_id in self.dependencies.ready),
+                      key=lambda task: self.position(task.id))
+        
+    def query(self, text: str) -> Iterator[Task]:
+        """Run a query such as ``status:todo priority>=2 sort:-priority limit:10``"""
+        from .query import parse_query, plan_query
+        return plan_query(parse_query(text), self).execute()
+        
+    @_synchronized
     def mark_complete(self, task_id: int) -> bool:
         """Mark task as completed"""
         task = self.get_task(task_id)
         if task:
+            self._unindex_task(task)
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.now().isoformat()
+            self._index_task(task)
+            self._sync_dependency_state(task)
             self.save_data()
             return True
         return False
         
-    def save_data(self):
-        """Save tasks to JSON file"""
+    @_synchronized
+    def archive_completed(self, older_than_days: int = config.ARCHIVE_AFTER_DAYS) -> int:
+        """Move tasks completed more than ``older_than_days`` ago into the archive"""
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        stale = [task for task in self.tasks
+                 if task.status == TaskStatus.COMPLETED
+                 and task.completed_at and task.completed_at < cutoff]
+        if not stale:
+            self.archive.clear_pending()
+            return 0
+            
+        # Segments are written before the hot file so a crash can't lose tasks;
+        # the archive skips tasks it already stored if the save below never happened
+        self.archive.archive([task_to_dict(task) for task in stale])
+        stale_ids = {task.id for task in stale}
+        self.tasks = [task for task in self.tasks if task.id not in stale_ids]
+        for task in stale:
+            self.tags.remove(task)
+        self.rebuild_indexes(rebuild_tags=False)
+        if self.save_data():
+            self.archive.clear_pending()
+        return len(stale)
+        
+    def iter_archived_tasks(self, month: Optional[str] = None) -> Iterator[Task]:
+        """Lazily read archived tasks, optionally for a single YYYY-MM month"""
+        for task_data in self.archive.iter_tasks(month):
+            yield task_from_dict(task_data)
+            
+    def completed_count(self) -> int:
+        """Completed tasks across the hot list and the archive index"""
+        return len(self.get_tasks_by_status(TaskStatus.COMPLETED)) + self.archive.total_count()
+        
+    def export_json(self, path: str):
+        """Write tasks to a JSON file, regardless of the storage format"""
         data = {
-            'tasks': [],
+            'tasks': [task_to_dict(task) for task in self.tasks],
             'next_id': self.next_id
         }
-        
-        for task in self.tasks:
-            task_dict = asdict(task)
-            task_dict['priority'] = task.priority.value
-            task_dict['status'] = task.status.value
-            data['tasks'].append(task_dict)
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, path)
             
+    def uses_snapshot(self) -> bool:
+        """Whether the data file is a binary snapshot rather than JSON"""
+        return self.data_file.endswith('.snap')
+        
+    @_synchronized
+    def save_data(self) -> bool:
+        """Save tasks to the data file; returns False if that failed"""
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if self.uses_snapshot():
+                from .snapshot import write_snapshot
+                write_snapshot(self.data_file, self.tasks, self.next_id)
+            else:
+                self.export_json(self.data_file)
         except Exception as e:
             print(f"Error saving data: {e}")
+            return False
+        self.tags.save_data(self.tag_index_file, self.data_file)
+        if self.on_save:
+            self.on_save(self)
+        return True
             
     def load_data(self):
-        """Load tasks from JSON file"""
+        """Load tasks from the data file"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
+            if self.uses_snapshot() and os.path.exists(self.data_file):
+                from .snapshot import TaskSnapshot
+                with TaskSnapshot(self.data_file) as snapshot:
+                    self.next_id = snapshot.next_id
+                    self.tasks = snapshot.load_all()
+                return
+                
+            # A snapshot store without a snapshot yet starts from the JSON file next to it
+            json_file = self.data_file
+            if self.uses_snapshot():
+                json_file = os.path.splitext(self.data_file)[0] + '.json'
+            if os.path.exists(json_file):
+                with open(json_file, 'r') as f:
                     data = json.load(f)
                     
                 self.next_id = data.get('next_id', 1)
                 
                 for task_data in data.get('tasks', []):
-                    task = Task(
-                        id=task_data['id'],
-                        title=task_data['title'],
-                        description=task_data.get('description', ''),
-                        priority=Priority(task_data.get('priority', 2)),
-                        status=TaskStatus(task_data.get('status', 'todo')),
-                        created_at=task_data.get('created_at', ''),
-                        completed_at=task_data.get('completed_at')
-                    )
-                    self.tasks.append(task)
+                    self.tasks.append(task_from_dict(task_data))
         except Exception as e:
             print(f"Error loading data: {e}")
-
-
-
-
-
-
-
-
-
-
-